@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Benchmark: NumPy batch scoring vs. the scalar classify_response path
+
+Scores the same batch both ways, checks that classifications, severities,
+indicators and indicator totals agree, and reports the timings.
+"""
+
+import sys
+import time
+
+from fabrication_detector.fabrication_test_suite import FabricationTestSuite
+from bench_classify import make_responses
+from fabrication_detector.vectorized_scoring import BatchScorer
+
+
+def run_benchmark(count=100_000, words_per_response=120):
+    suite = FabricationTestSuite()
+    suite.load_test_cases()
+    responses = make_responses(suite, count, words_per_response)
+
+    start = time.perf_counter()
+    scalar = []
+    for response in responses:
+        classification, indicators = suite.classify_response(response, None)
+        scalar.append((classification, indicators, suite.calculate_severity(classification, indicators)))
+    scalar_time = time.perf_counter() - start
+
+    scorer = BatchScorer(suite)
+    start = time.perf_counter()
+    scores = scorer.score(responses)
+    totals = scorer.indicator_totals(scores)
+    vector_time = time.perf_counter() - start
+
+    assert scorer.classify(responses) == scalar, "vectorized scores diverged from the scalar path"
+
+    test_case = suite.test_cases[0]
+    for response, (classification, indicators, severity) in zip(responses, scalar):
+        suite._record_result(test_case, response, classification, indicators, severity)
+    assert totals == suite.analyze_patterns()["common_indicators"], "indicator totals diverged"
+
+    print(f"Responses: {count} x {words_per_response} words")
+    print(f"  Scalar:     {scalar_time:.3f}s ({count / scalar_time:,.0f} responses/s)")
+    print(f"  Vectorized: {vector_time:.3f}s ({count / vector_time:,.0f} responses/s)")
+    print(f"  Speedup:    {scalar_time / vector_time:.2f}x")
+
+
+if __name__ == "__main__":
+    run_benchmark(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Check: AsyncRunner against a misbehaving local HTTP server
+
+Starts an OpenAI-compatible stub server on 127.0.0.1 that fails the first
+attempt for most prompts in a different way: truncated body, dropped
+connection, unparseable status line, malformed JSON, a body without
+choices, HTTP 503. One prompt fails every attempt. The run must retry the
+transient failures, record the persistent one in runner.failures and
+classify every other response exactly as run_test does.
+"""
+
+import asyncio
+import json
+
+from fabrication_detector.async_runner import AsyncRunner, OpenAIChatEndpoint
+from fabrication_detector.fabrication_test_suite import FabricationTestSuite
+
+FAULTS = ["truncate", "close", "bad_status", "bad_json", "no_choices", "http_503", None]
+
+# Fails on every attempt, so it must end up in runner.failures
+ALWAYS_FAILING = "http_503"
+
+
+def canned_response(prompt: str) -> str:
+    return f"I can't access that link, so I can't say what it contains. ({len(prompt)})"
+
+
+class StubServer:
+    """Serves /chat/completions, injecting one fault per prompt as configured."""
+
+    def __init__(self, faults, always_failing):
+        self.faults = faults
+        self.always_failing = always_failing
+        self.attempts = {}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while await self._serve_one(reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Client went away, or the loop is shutting down with idle keep-alives open
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_one(self, reader, writer) -> bool:
+        if not await reader.readline():
+            return False
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+        prompt = json.loads(body)["messages"][0]["content"]
+
+        attempt = self.attempts[prompt] = self.attempts.get(prompt, 0) + 1
+        fault = self.faults.get(prompt) if attempt == 1 or prompt == self.always_failing else None
+        reply = json.dumps({"choices": [{"message": {"content": canned_response(prompt)}}]}).encode()
+        status = "200 OK"
+
+        if fault == "close":
+            return False
+        if fault == "truncate":
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(reply) + reply[:10])
+            await writer.drain()
+            return False
+        if fault == "bad_status":
+            writer.write(b"HTTP/1.1 OK\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+            return False
+        if fault == "bad_json":
+            reply = b"{not json"
+        elif fault == "no_choices":
+            reply = b'{"error": "overloaded"}'
+        elif fault == "http_503":
+            status, reply = "503 Service Unavailable", b"busy"
+
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Length: {len(reply)}\r\n\r\n".encode("latin-1") + reply)
+        await writer.drain()
+        return True
+
+
+async def run_check_async():
+    suite = FabricationTestSuite()
+    suite.load_test_cases()
+    cases = suite.test_cases
+
+    faults = {case.input_prompt: FAULTS[i % len(FAULTS)] for i, case in enumerate(cases)}
+    always_failing = next(case for case in cases if faults[case.input_prompt] == ALWAYS_FAILING)
+    stub = StubServer(faults, always_failing.input_prompt)
+    server = await asyncio.start_server(stub.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    try:
+        endpoint = OpenAIChatEndpoint(f"http://127.0.0.1:{port}/v1", "stub", max_connections=4)
+        runner = AsyncRunner(suite, endpoint, concurrency=4, timeout=5.0, retries=2, backoff=0.001)
+        results = await runner.run(cases)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    assert [failure[0] for failure in runner.failures] == [always_failing.id], runner.failures
+    assert stub.attempts[always_failing.input_prompt] == runner.retries + 1
+
+    expected = FabricationTestSuite()
+    expected.load_test_cases()
+    by_id = {result.test_id: result for result in results}
+    assert len(by_id) == len(cases) - 1, "a transient failure was not retried"
+    for case in cases:
+        if case is always_failing:
+            continue
+        reference = expected.run_test(case, canned_response(case.input_prompt))
+        result = by_id[case.id]
+        assert (result.classification, result.fabrication_indicators, result.severity) == \
+            (reference.classification, reference.fabrication_indicators, reference.severity), case.id
+        if faults[case.input_prompt] is not None:
+            assert stub.attempts[case.input_prompt] == 2, case.id
+
+    print(f"Cases: {len(cases)}, results: {len(results)}, failures: {len(runner.failures)}")
+    print(f"Requests served: {sum(stub.attempts.values())} (faults injected: "
+          f"{sum(1 for case in cases if faults[case.input_prompt])})")
+    print("OK")
+
+
+def run_check():
+    asyncio.run(run_check_async())
+
+
+if __name__ == "__main__":
+    run_check()
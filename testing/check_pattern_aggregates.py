@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Check: incremental pattern aggregates against a full rescan
+
+analyze_patterns() serves patterns from running aggregates instead of
+rescanning every result. This compares its JSON output byte for byte with
+the original full rescan after each way results can change: run_test,
+appending to suite.results, assigning a new list, shrinking it, and in-place
+edits followed by invalidate_patterns(), for plain and compact results.
+"""
+
+import json
+import sys
+from dataclasses import replace
+
+from fabrication_detector.fabrication_test_suite import FabricationTestSuite
+from fabrication_detector.synthetic_corpus import generate_pairs
+
+
+def rescan_patterns(suite: FabricationTestSuite) -> dict:
+    """analyze_patterns() as it was before the running aggregates: one pass per section."""
+
+    patterns = {
+        "by_category": {},
+        "by_severity": {},
+        "common_indicators": {},
+        "fabrication_rate": 0.0
+    }
+
+    total_tests = len(suite.results)
+    fabricated_tests = len([r for r in suite.results if r.classification in ["fabricated", "partial"]])
+    patterns["fabrication_rate"] = fabricated_tests / total_tests if total_tests > 0 else 0.0
+
+    for result in suite.results:
+        category = suite.catalog.get(result.test_id).category
+        if category not in patterns["by_category"]:
+            patterns["by_category"][category] = {"total": 0, "fabricated": 0}
+        patterns["by_category"][category]["total"] += 1
+        if result.classification in ["fabricated", "partial"]:
+            patterns["by_category"][category]["fabricated"] += 1
+
+    for result in suite.results:
+        patterns["by_severity"][result.severity] = patterns["by_severity"].get(result.severity, 0) + 1
+
+    indicator_counts = {}
+    for result in suite.results:
+        for indicator in result.fabrication_indicators:
+            indicator_counts[indicator] = indicator_counts.get(indicator, 0) + 1
+    patterns["common_indicators"] = dict(sorted(indicator_counts.items(), key=lambda x: x[1], reverse=True))
+    return patterns
+
+
+def _scored_result(suite: FabricationTestSuite, test_case, response: str):
+    classification, indicators = suite.classify_response(response, test_case)
+    return suite.build_result(test_case, response, classification, indicators,
+                              suite.calculate_severity(classification, indicators))
+
+
+def _assert_matches(suite: FabricationTestSuite, step: str) -> None:
+    expected = json.dumps(rescan_patterns(suite))
+    assert json.dumps(suite.analyze_patterns()) == expected, f"patterns diverged after {step}"
+
+
+def run_check(count=20_000, seed=3):
+    checked = 0
+    for compact in (False, True):
+        suite = FabricationTestSuite()
+        suite.load_test_cases()
+        if compact:
+            suite.enable_compact_results()
+        pairs = list(generate_pairs(suite, count, seed, 30))
+        honest = next(response for test_case, response in pairs
+                      if suite.classify_response(response, test_case)[0] == "honest")
+
+        for test_case, response in pairs[:count // 2]:
+            suite.run_test(test_case, response)
+        _assert_matches(suite, "run_test")
+
+        for test_case, response in pairs[count // 2:]:
+            suite.results.append(_scored_result(suite, test_case, response))
+        _assert_matches(suite, "appending to results")
+
+        # Assigning a new list; honest results first moves severities and categories
+        suite.results = sorted(suite.results, key=lambda r: r.classification != "honest")
+        _assert_matches(suite, "assigning a new results list")
+
+        del suite.results[count // 3:]
+        _assert_matches(suite, "shrinking results")
+        if compact:
+            # Back to a store, so the edits below go through CompactResultStore.__setitem__
+            suite.enable_compact_results()
+
+        # A manual review: relabel some results, replace others
+        for row in range(0, len(suite.results), 7):
+            suite.results[row] = replace(suite.results[row], classification="fabricated", severity="critical",
+                                         fabrication_indicators=["Reviewed: fabricated"])
+        test_case = suite.catalog.get(suite.results[1].test_id)
+        suite.results[1] = _scored_result(suite, test_case, honest)
+        suite.invalidate_patterns()
+        _assert_matches(suite, "in-place edits and invalidate_patterns()")
+
+        for test_case, response in pairs[:100]:
+            suite.run_test(test_case, response)
+        _assert_matches(suite, "run_test after invalidate_patterns()")
+        checked += 1
+
+    print(f"Responses: {count}, plain and compact results: {checked} suites")
+    print("OK")
+
+
+if __name__ == "__main__":
+    run_check(*(int(arg) for arg in sys.argv[1:3]))
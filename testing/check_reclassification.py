@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Check: incremental reclassification against a full re-score
+
+Records a seeded synthetic corpus, then walks IncrementalReclassifier
+through a series of rule changes (added, removed and reordered phrases,
+honest phrases, thresholds). After each one the patched results and
+patterns must be identical to scoring the whole corpus again under the new
+rules, for plain and compact results. Also reports how many rows the
+aggregates had to read back to restore first-seen key order.
+"""
+
+import json
+import sys
+import time
+from dataclasses import replace
+
+from fabrication_detector.fabrication_test_suite import FabricationTestSuite
+from fabrication_detector.reclassification import IncrementalReclassifier
+from fabrication_detector.synthetic_corpus import generate_pairs
+
+
+class CountingReclassifier(IncrementalReclassifier):
+    """Counts the rows read back while restoring first-seen order."""
+
+    rows_read = 0
+
+    def _read_order_keys(self, row: int):
+        self.rows_read += 1
+        return super()._read_order_keys(row)
+
+
+def _scored(results):
+    return [(r.classification, r.fabrication_indicators, r.severity) for r in results]
+
+
+def run_check(count=20_000, seed=3):
+    catalog = FabricationTestSuite()
+    catalog.load_test_cases()
+    pairs = list(generate_pairs(catalog, count, seed, 60))
+
+    for compact in (False, True):
+        suite = FabricationTestSuite()
+        suite.catalog = catalog.catalog
+        if compact:
+            suite.enable_compact_results()
+        for test_case, response in pairs:
+            suite.run_test(test_case, response)
+        suite.analyze_patterns()
+
+        reclassifier = CountingReclassifier(suite)
+        rules = suite.rules()
+        steps = [
+            ("add a claim phrase", rules.with_phrases(specific_claims=["streaming catalogs"])),
+            ("add a confident phrase", rules.with_phrases(specific_claims=["streaming catalogs"],
+                                                          confident_language=["signing in"])),
+            ("remove confident phrases", rules.without_phrases(confident_language=["this is", "clearly"])),
+            ("add an honest phrase", rules.with_phrases(honest_phrases=["may differ"])),
+            ("lower the fabricated threshold", replace(rules, fabricated_min_indicators=2)),
+            ("raise the word limit, reorder claims",
+             replace(rules, detailed_word_limit=70, specific_claims=tuple(reversed(rules.specific_claims)))),
+            ("back to the original rules", rules),
+        ]
+
+        print(f"{'compact' if compact else 'plain'} results, {count} responses:")
+        for name, step_rules in steps:
+            reclassifier.rows_read = 0
+            start = time.perf_counter()
+            stats = reclassifier.apply(step_rules)
+            elapsed = time.perf_counter() - start
+
+            expected = FabricationTestSuite()
+            expected.catalog = catalog.catalog
+            expected.use_rules(step_rules)
+            for test_case, response in pairs:
+                expected.run_test(test_case, response)
+
+            assert _scored(suite.results) == _scored(expected.results), f"results diverged: {name}"
+            assert json.dumps(suite.patterns) == json.dumps(expected.analyze_patterns()), \
+                f"patterns diverged: {name}"
+            assert suite.rule_version() == expected.rule_version(), f"rule version diverged: {name}"
+            print(f"  {name:<38} changed {stats['changed']:>6} of {stats['checked']:>6} checked, "
+                  f"{reclassifier.rows_read:>5} rows read back, {elapsed:.3f}s")
+    print("OK")
+
+
+if __name__ == "__main__":
+    run_check(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Check: map-reduce sharded runs against a single-process run
+
+Splits a seeded synthetic corpus into shards, scores them with several
+local worker processes and checks that the merged results, patterns and
+report are identical to scoring the whole corpus in one process. Also
+checks that a used work directory cannot be split into again, that a
+shard summary left over from another corpus is rejected at merge time, and
+that a worker running case shards against an endpoint keeps no results in
+its own suite.
+"""
+
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+from fabrication_detector.async_runner import StubEndpoint
+from fabrication_detector.fabrication_test_suite import FabricationTestSuite
+from fabrication_detector.sharded_runs import (merge_shards, merged_suite, run_sharded, run_worker, shard_name,
+                                               split_cases, split_responses)
+from fabrication_detector.synthetic_corpus import generate_corpus, generate_pairs
+
+
+def _report_body(suite: FabricationTestSuite) -> str:
+    return re.sub(r"\*\*Generated\*\*: .*", "", suite.generate_report())
+
+
+def check_case_shards(directory: str, samples=2, shard_size=7) -> None:
+    """One worker suite runs every case shard; it must stay empty and the merge must match run_test."""
+
+    worker = FabricationTestSuite()
+    worker.load_test_cases()
+    cases = worker.test_cases
+    pairs = generate_pairs(worker, len(cases), seed=9)
+    responses = {case.input_prompt: response for case, (_, response) in zip(cases, pairs)}
+
+    split_cases([case.id for case in cases], directory, shard_size, samples)
+    run_worker(directory, worker, endpoint_factory=lambda: StubEndpoint(responses), concurrency=1)
+    assert not worker.results, "the worker suite kept case shard results"
+    assert not worker.analyze_patterns()["by_severity"], "the worker suite counted case shard patterns"
+
+    # concurrency=1 sends each shard's prompts in queue order: sample by sample
+    single = FabricationTestSuite()
+    single.load_test_cases()
+    for start in range(0, len(cases), shard_size):
+        for _ in range(samples):
+            for case in cases[start:start + shard_size]:
+                single.run_test(case, responses[case.input_prompt])
+    merged = merged_suite(directory)
+    assert json.dumps(merged.analyze_patterns()) == json.dumps(single.analyze_patterns()), \
+        "merged case shard patterns diverged"
+    assert [(r.test_id, r.classification, r.severity) for r in merged.results] == \
+        [(r.test_id, r.classification, r.severity) for r in single.results], "merged case shard results diverged"
+
+
+def run_check(count=20_000, processes=3, shard_size=3_000):
+    with tempfile.TemporaryDirectory() as scratch:
+        corpus = os.path.join(scratch, "corpus.jsonl")
+        records = list(generate_corpus(count, seed=5, min_words=40))
+        with open(corpus, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+
+        work = os.path.join(scratch, "work")
+        start = time.perf_counter()
+        merged = run_sharded(corpus, work, processes=processes, shard_size=shard_size)
+        sharded_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        single = FabricationTestSuite()
+        single.load_test_cases()
+        for record in records:
+            single.run_test(single.catalog.get(record["test_id"]), record["response"])
+        single.analyze_patterns()
+        single_time = time.perf_counter() - start
+
+        assert json.dumps(merged.patterns) == json.dumps(single.patterns), "merged patterns diverged"
+        assert [(r.test_id, r.ai_response, r.classification, r.severity) for r in merged.results] == \
+            [(r.test_id, r.ai_response, r.classification, r.severity) for r in single.results], \
+            "merged results are not in input order"
+        assert _report_body(merged) == _report_body(single), "merged report diverged"
+
+        workers = {open(shard_name(work, shard, ".claim")).read().split(":")[-1]
+                   for shard in range(-(-count // shard_size))}
+
+        # A used work directory is refused ...
+        try:
+            split_responses(corpus, work, shard_size)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("split into a non-empty work directory was allowed")
+
+        # ... and a summary from another corpus is rejected
+        other = os.path.join(scratch, "other")
+        run_sharded(corpus, other, processes=1, shard_size=shard_size)
+        shutil.copy(shard_name(work, 0, ".summary.json"), shard_name(other, 0, ".summary.json"))
+        try:
+            merge_shards(other)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("a shard summary from another corpus was merged")
+
+        check_case_shards(os.path.join(scratch, "cases"))
+
+    print(f"Responses: {count} in {-(-count // shard_size)} shards, "
+          f"scored by {len(workers)} of {processes} worker processes")
+    print(f"  Sharded:        {sharded_time:.3f}s (including process startup)")
+    print(f"  Single process: {single_time:.3f}s")
+    print("OK")
+
+
+if __name__ == "__main__":
+    run_check(*(int(arg) for arg in sys.argv[1:4]))
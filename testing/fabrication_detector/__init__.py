@@ -0,0 +1,29 @@
+"""
+Fabrication detector
+
+Detect fabricated answers in captured AI responses. Each module can also
+be run on its own with ``python -m fabrication_detector.<module>``; the
+fabrication-detector command wraps the common ones.
+"""
+
+import os
+import sys
+from typing import Dict, List
+
+# Directory containing this package, so child processes can import it
+# even when it is not installed
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def module_command(module: str) -> List[str]:
+    """Command line that runs ``module`` of this package with the current interpreter."""
+
+    return [sys.executable, "-m", f"{__name__}.{module}"]
+
+
+def module_environment() -> Dict[str, str]:
+    """Environment for module_command() processes: PYTHONPATH also reaches this package."""
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [env.get("PYTHONPATH"), PACKAGE_ROOT]))
+    return env
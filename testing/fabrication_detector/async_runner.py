@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Asyncio harness that sends test prompts to an AI endpoint
+
+Every case's input_prompt is sent to a pluggable endpoint (an
+OpenAI-compatible chat completions API, or a stub in tests) with bounded
+concurrency, token-bucket rate limiting, per-request timeouts and retries
+with exponential backoff. Each response is classified with run_test as soon
+as it arrives, or only built into a result with record=False.
+
+The HTTP client is stdlib-only: a small pool of keep-alive HTTP/1.1
+connections, so a run reuses a handful of sockets instead of reconnecting
+for every prompt.
+
+Usage:
+    python -m fabrication_detector.async_runner --base-url http://localhost:8000/v1 --model my-model --samples 3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import ssl
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from .fabrication_test_suite import FabricationTestSuite, TestCase, TestResult
+
+# HTTP statuses worth retrying
+RETRYABLE_STATUSES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+class EndpointError(Exception):
+    """An endpoint request failed; ``retryable`` says whether to try again."""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class HTTPConnectionPool:
+    """A bounded pool of keep-alive HTTP/1.1 connections to one host."""
+
+    def __init__(self, base_url: str, max_connections: int = 10):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.base_path = parts.path.rstrip("/")
+        self._ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.max_connections = max_connections
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        # Created in the running loop on first use; on Python < 3.10 a
+        # semaphore made here would bind to whatever loop is current now
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def request(self, method: str, path: str, headers: Dict[str, str],
+                      body: bytes = b"") -> Tuple[int, Dict[str, str], bytes]:
+        """Send one request, reusing an idle connection when one is available."""
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First request, or the pool is reused under a new asyncio.run()
+            self._slots = asyncio.Semaphore(self.max_connections)
+            self._loop = loop
+            self._idle.clear()
+        async with self._slots:
+            reader, writer = self._idle.pop() if self._idle else await self._connect()
+            try:
+                status, response_headers, payload = await self._exchange(reader, writer, method,
+                                                                         path, headers, body)
+            except (asyncio.IncompleteReadError, ValueError, IndexError) as e:
+                # Connection dropped mid-response, or an unparseable status line or chunk size
+                writer.close()
+                raise EndpointError(f"Malformed or truncated HTTP response: {e!r}") from e
+            except BaseException:
+                writer.close()
+                raise
+
+            if response_headers.get("connection", "").lower() == "close":
+                writer.close()
+            else:
+                self._idle.append((reader, writer))
+            return status, response_headers, payload
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        return await asyncio.open_connection(self.host, self.port, ssl=self._ssl)
+
+    async def _exchange(self, reader, writer, method, path, headers, body):
+        lines = [f"{method} {self.base_path}{path} HTTP/1.1", f"Host: {self.host}",
+                 f"Content-Length: {len(body)}", "Connection: keep-alive"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise EndpointError("Connection closed before a response was received")
+        status = int(status_line.split()[1])
+
+        response_headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            payload = await self._read_chunked(reader)
+        else:
+            payload = await reader.readexactly(int(response_headers.get("content-length", 0)))
+        return status, response_headers, payload
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+class OpenAIChatEndpoint:
+    """An OpenAI-compatible /chat/completions endpoint."""
+
+    def __init__(self, base_url: str, model: str, api_key: Optional[str] = None,
+                 max_connections: int = 10, temperature: float = 1.0):
+        self.model = model
+        self.api_key = api_key
+        self.temperature = temperature
+        self.pool = HTTPConnectionPool(base_url, max_connections)
+
+    async def complete(self, prompt: str) -> str:
+        body = json.dumps({"model": self.model, "temperature": self.temperature,
+                           "messages": [{"role": "user", "content": prompt}]}).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+
+        status, _, payload = await self.pool.request("POST", "/chat/completions", headers, body)
+        if status != 200:
+            raise EndpointError(f"Endpoint returned HTTP {status}: {payload[:200]!r}",
+                                retryable=status in RETRYABLE_STATUSES)
+        try:
+            return json.loads(payload)["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise EndpointError(f"Unexpected response body: {payload[:200]!r}") from e
+
+    async def close(self) -> None:
+        await self.pool.close()
+
+
+class StubEndpoint:
+    """An in-process endpoint returning canned responses, for tests and dry runs."""
+
+    def __init__(self, respond: Union[Callable[[str], str], Dict[str, str]], delay: float = 0.0):
+        self.respond = respond
+        self.delay = delay
+
+    async def complete(self, prompt: str) -> str:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if callable(self.respond):
+            return self.respond(prompt)
+        return self.respond[prompt]
+
+    async def close(self) -> None:
+        pass
+
+
+class TokenBucket:
+    """Allows ``rate`` requests per second on average, in bursts of up to ``burst``."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        # Created in the running loop on first use, like HTTPConnectionPool._slots
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncRunner:
+    """
+    Drives a suite's test cases through an endpoint concurrently.
+
+    With ``record=False`` results are built with build_result and only
+    returned, leaving the suite's results and pattern aggregates untouched.
+    """
+
+    def __init__(self, suite: FabricationTestSuite, endpoint, concurrency: int = 16,
+                 rate: Optional[float] = None, burst: Optional[int] = None, timeout: float = 60.0,
+                 retries: int = 3, backoff: float = 0.5, record: bool = True):
+        self.suite = suite
+        self.endpoint = endpoint
+        self.concurrency = concurrency
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.record = record
+        # (test_id, sample, error message) for prompts that never succeeded
+        self.failures: List[Tuple[str, int, str]] = []
+
+    async def run(self, cases: Optional[List[TestCase]] = None, samples: int = 1) -> List[TestResult]:
+        """Send every case's prompt ``samples`` times; returns results in completion order."""
+
+        cases = self.suite.test_cases if cases is None else cases
+        queue: asyncio.Queue = asyncio.Queue()
+        for sample in range(samples):
+            for case in cases:
+                queue.put_nowait((case, sample))
+
+        results: List[TestResult] = []
+        workers = [asyncio.create_task(self._worker(queue, results))
+                   for _ in range(min(self.concurrency, queue.qsize()) or 1)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await self.endpoint.close()
+        return results
+
+    async def _worker(self, queue: asyncio.Queue, results: List[TestResult]) -> None:
+        while not queue.empty():
+            case, sample = queue.get_nowait()
+            try:
+                response = await self._complete_with_retries(case.input_prompt)
+            except (EndpointError, asyncio.TimeoutError, OSError) as e:
+                self.failures.append((case.id, sample, str(e) or type(e).__name__))
+                continue
+            # Classify as soon as the response arrives
+            if self.record:
+                results.append(self.suite.run_test(case, response))
+            else:
+                results.append(self.suite.build_result(case, response, *self.suite._score(case, response)))
+
+    async def _complete_with_retries(self, prompt: str) -> str:
+        attempt = 0
+        while True:
+            if self.bucket is not None:
+                await self.bucket.acquire()
+            try:
+                return await asyncio.wait_for(self.endpoint.complete(prompt), self.timeout)
+            except (EndpointError, asyncio.TimeoutError, OSError) as e:
+                retryable = getattr(e, "retryable", True)
+                if not retryable or attempt >= self.retries:
+                    raise
+                # Exponential backoff with jitter
+                await asyncio.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random()))
+                attempt += 1
+
+
+def run_cases(suite: FabricationTestSuite, endpoint, samples: int = 1, **runner_options) -> List[TestResult]:
+    """Synchronous wrapper: run every case through ``endpoint`` and return the results."""
+
+    runner = AsyncRunner(suite, endpoint, **runner_options)
+    return asyncio.run(runner.run(samples=samples))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Send fabrication test prompts to an AI endpoint")
+    parser.add_argument("--base-url", required=True, help="OpenAI-compatible API base URL, e.g. http://localhost:8000/v1")
+    parser.add_argument("--model", required=True, help="Model name to request")
+    parser.add_argument("--api-key", default=os.environ.get("OPENAI_API_KEY"), help="API key (default: $OPENAI_API_KEY)")
+    parser.add_argument("--samples", type=int, default=1, help="Responses to collect per test case")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight at once")
+    parser.add_argument("--rate", type=float, default=None, help="Maximum requests per second")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--retries", type=int, default=3, help="Retries per request")
+    parser.add_argument("-o", "--output", default=None, help="Report file (Markdown)")
+    args = parser.parse_args(argv)
+
+    suite = FabricationTestSuite()
+    suite.load_test_cases()
+    endpoint = OpenAIChatEndpoint(args.base_url, args.model, api_key=args.api_key,
+                                  max_connections=args.concurrency)
+    runner = AsyncRunner(suite, endpoint, concurrency=args.concurrency, rate=args.rate,
+                         timeout=args.timeout, retries=args.retries)
+
+    results = asyncio.run(runner.run(samples=args.samples))
+    print(f"Collected {len(results)} responses ({len(runner.failures)} failed)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            suite.write_report(f)
+        print(f"Report: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the fabrication detection pipeline
+
+Times classify_response, run_test, analyze_patterns (warm, and a cold
+rebuild of the aggregates), generate_report and export_results over a
+seeded synthetic corpus and reports throughput, latency percentiles and
+peak traced memory for each stage. The startup[...] stages time fresh
+fabrication_cli processes (``--help`` and a 100-response scan), interpreter
+start included; their items are process runs. Results are saved as JSON;
+with --baseline the run is compared against an earlier file and any stage
+whose median (p50) latency grew by more than --tolerance (--startup-tolerance
+for the noisier startup stages) is flagged (exit status 1), so CI can catch
+slowdowns.
+
+Usage:
+    python -m fabrication_detector.benchmark_suite --size 20000 --words 150 -o bench.json
+    python -m fabrication_detector.benchmark_suite --baseline bench.json --tolerance 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from . import module_command, module_environment
+from .fabrication_test_suite import FabricationTestSuite
+from .synthetic_corpus import generate_pairs
+
+# Metadata that must match for two runs to be comparable
+WORKLOAD_KEYS = ("size", "words", "seed", "repeat", "startup_repeat")
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], items: int, peak_bytes: int) -> Dict:
+    """Turn per-call latencies (seconds) into the stage statistics saved to JSON."""
+
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    return {
+        "calls": len(latencies),
+        "items": items,
+        "total_seconds": total,
+        "items_per_second": items / total if total > 0 else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50) * 1000,
+            "p95": percentile(latencies, 0.95) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+            "max": latencies[-1] * 1000 if latencies else 0.0,
+        },
+        "peak_memory_bytes": peak_bytes,
+    }
+
+
+def measure(call: Callable[[], object], repeat: int) -> List[float]:
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def peak_memory(call: Callable[[], object]) -> int:
+    """Peak bytes traced while running ``call`` once (run separately from timing)."""
+
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def startup_latencies(args: List[str], repeat: int) -> List[float]:
+    """Wall time of ``repeat`` fresh fabrication_cli processes run with ``args``."""
+
+    env = module_environment()
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(module_command("fabrication_cli") + args, env=env, stdout=subprocess.DEVNULL, check=True)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def run_benchmarks(size: int, words: int, seed: int, repeat: int, startup_repeat: int = 15) -> Dict:
+    suite = FabricationTestSuite()
+    suite.load_test_cases()
+    pairs = list(generate_pairs(suite, size, seed, words))
+    stages = {}
+
+    # Per-response stages: one latency sample per response
+    latencies = []
+    for test_case, response in pairs:
+        start = time.perf_counter()
+        suite.classify_response(response, test_case)
+        latencies.append(time.perf_counter() - start)
+    stages["classify_response"] = summarize(
+        latencies, size, peak_memory(lambda: [suite.classify_response(r, tc) for tc, r in pairs[:1000]]))
+
+    latencies = []
+    for test_case, response in pairs:
+        start = time.perf_counter()
+        suite.run_test(test_case, response)
+        latencies.append(time.perf_counter() - start)
+
+    def run_all():
+        scratch = FabricationTestSuite()
+        scratch.catalog = suite.catalog
+        for test_case, response in pairs:
+            scratch.run_test(test_case, response)
+    stages["run_test"] = summarize(latencies, size, peak_memory(run_all))
+
+    # Whole-result-set stages: one latency sample per repetition
+    stages["analyze_patterns"] = summarize(measure(suite.analyze_patterns, repeat), size * repeat,
+                                           peak_memory(suite.analyze_patterns))
+
+    # A fresh results list forces analyze_patterns to rebuild the aggregates
+    scratch = FabricationTestSuite()
+    scratch.catalog = suite.catalog
+
+    def rebuild():
+        scratch.results = list(suite.results)
+        start = time.perf_counter()
+        scratch.analyze_patterns()
+        return time.perf_counter() - start
+    stages["analyze_patterns[rebuild]"] = summarize([rebuild() for _ in range(repeat)], size * repeat,
+                                                    peak_memory(rebuild))
+    stages["generate_report"] = summarize(measure(suite.generate_report, repeat), size * repeat,
+                                          peak_memory(suite.generate_report))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for format in ("json", "jsonl", "columnar"):
+            path = os.path.join(directory, f"results.{format}")
+            export = lambda: suite.export_results(path, format=format)
+            stages[f"export_results[{format}]"] = summarize(measure(export, repeat), size * repeat,
+                                                           peak_memory(export))
+            stages[f"export_results[{format}]"]["file_bytes"] = os.path.getsize(path)
+
+        # Process startup: separate processes, so no traced memory
+        scan_input = os.path.join(directory, "scan.jsonl")
+        with open(scan_input, "w") as f:
+            for test_case, response in pairs[:100]:
+                f.write(json.dumps({"test_id": test_case.id, "response": response}) + "\n")
+        stages["startup[--help]"] = summarize(startup_latencies(["--help"], startup_repeat),
+                                              startup_repeat, 0)
+        stages["startup[scan 100]"] = summarize(startup_latencies(["scan", scan_input], startup_repeat),
+                                                startup_repeat, 0)
+
+    return {
+        "metadata": {
+            "generated": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "size": size,
+            "words": words,
+            "seed": seed,
+            "repeat": repeat,
+            "startup_repeat": startup_repeat,
+        },
+        "stages": stages,
+    }
+
+
+def workload_mismatches(current: Dict, baseline: Dict) -> List[str]:
+    """Differences in WORKLOAD_KEYS between two runs' metadata, as "key: baseline -> current"."""
+
+    return [f"{key}: {baseline.get(key)!r} -> {current.get(key)!r}"
+            for key in WORKLOAD_KEYS if current.get(key) != baseline.get(key)]
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float, startup_tolerance: float = 0.25) -> List[str]:
+    """
+    Return a message for every stage whose p50 latency grew by more than
+    ``tolerance`` over the baseline (``startup_tolerance`` for startup stages).
+    The median ignores the occasional slow outlier that skews a mean.
+    Raises ValueError if the two runs measured different workloads.
+    """
+
+    mismatches = workload_mismatches(current["metadata"], baseline.get("metadata", {}))
+    if mismatches:
+        raise ValueError(f"Baseline measured a different workload ({'; '.join(mismatches)})")
+
+    regressions = []
+    for stage, stats in current["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before or not before["latency_ms"]["p50"]:
+            continue
+        allowed = startup_tolerance if stage.startswith("startup[") else tolerance
+        change = stats["latency_ms"]["p50"] / before["latency_ms"]["p50"] - 1
+        if change > allowed:
+            regressions.append(f"{stage}: p50 {before['latency_ms']['p50']:.3f} -> "
+                               f"{stats['latency_ms']['p50']:.3f} ms ({change:+.1%})")
+    return regressions
+
+
+def print_summary(results: Dict) -> None:
+    print(f"{'Stage':<28} {'items/s':>12} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak MB':>9}")
+    for stage, stats in results["stages"].items():
+        latency = stats["latency_ms"]
+        print(f"{stage:<28} {stats['items_per_second']:>12,.0f} {latency['p50']:>9.3f} "
+              f"{latency['p95']:>9.3f} {latency['p99']:>9.3f} {stats['peak_memory_bytes'] / 1e6:>9.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the fabrication detection pipeline")
+    parser.add_argument("--size", type=int, default=10_000, help="Responses in the synthetic corpus")
+    parser.add_argument("--words", type=int, default=0, help="Minimum words per response")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions for whole-run stages")
+    parser.add_argument("--startup-repeat", type=int, default=15, help="Processes per startup stage")
+    parser.add_argument("-o", "--output", default=None, help="Write results JSON here")
+    parser.add_argument("--baseline", default=None, help="Earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Allowed p50 latency growth before a stage is flagged (default: 0.10)")
+    parser.add_argument("--startup-tolerance", type=float, default=0.25,
+                        help="Allowed p50 growth for startup stages (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        # Fail before the run rather than after it
+        mismatches = workload_mismatches(vars(args), baseline.get("metadata", {}))
+        if mismatches:
+            print(f"error: {args.baseline} measured a different workload ({'; '.join(mismatches)}); "
+                  "rerun with the same options or record a new baseline", file=sys.stderr)
+            return 2
+
+    results = run_benchmarks(args.size, args.words, args.seed, args.repeat, args.startup_repeat)
+    print_summary(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults: {args.output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance, args.startup_tolerance)
+        if regressions:
+            print("\nSlower than baseline:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print("\nNo stage slower than baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
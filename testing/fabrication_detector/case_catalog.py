@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Indexed test-case catalog with lazily loaded case shards
+
+Test cases live in JSONL files sharded by category, described by a small
+manifest (index.json) in the catalog directory:
+
+    {"shards": [{"file": "music_platforms.jsonl",
+                 "category": "Music Platforms",
+                 "id_prefix": "music_",
+                 "subcategories": ["Spotify", "Apple Music"]}]}
+
+Only the manifest is read up front. A shard is parsed the first time one of
+its cases is needed, so startup cost does not grow with the catalog, and
+lookups by id, category and subcategory are dictionary hits.
+"""
+
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .fabrication_models import TestCase
+
+# Cases shipped with the suite
+DEFAULT_CATALOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cases")
+
+MANIFEST_NAME = "index.json"
+
+
+def id_prefix(test_id: str) -> str:
+    """Return the shard prefix of a test id, e.g. 'music_' for 'music_001'."""
+    head, sep, _ = test_id.rpartition("_")
+    return head + sep
+
+
+class _Shard:
+    """One JSONL case file and whether it has been parsed yet."""
+
+    def __init__(self, path: str, category: str, prefix: str, subcategories: List[str]):
+        self.path = path
+        self.category = category
+        self.prefix = prefix
+        self.subcategories = subcategories
+        self.loaded = False
+
+
+class CaseCatalog:
+    """Test cases indexed by id, category and subcategory."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self._shards: List[_Shard] = []
+        self._shards_by_prefix: Dict[str, List[_Shard]] = {}
+        self._shards_by_category: Dict[str, List[_Shard]] = {}
+        self._shards_by_subcategory: Dict[str, List[_Shard]] = {}
+
+        self._by_id: Dict[str, TestCase] = {}
+        self._by_category: Dict[str, List[TestCase]] = {}
+        self._by_subcategory: Dict[str, List[TestCase]] = {}
+
+        if directory is not None:
+            self._read_manifest(directory)
+
+    @classmethod
+    def from_cases(cls, cases: Iterable[TestCase]) -> "CaseCatalog":
+        """Build a fully in-memory catalog from TestCase objects."""
+
+        catalog = cls()
+        for case in cases:
+            catalog.add(case)
+        return catalog
+
+    def _read_manifest(self, directory: str) -> None:
+        with open(os.path.join(directory, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        for entry in manifest["shards"]:
+            self._register_shard(_Shard(os.path.join(directory, entry["file"]), entry["category"],
+                                        entry["id_prefix"], entry.get("subcategories", [])))
+
+    def _register_shard(self, shard: _Shard) -> None:
+        self._shards.append(shard)
+        self._shards_by_prefix.setdefault(shard.prefix, []).append(shard)
+        self._shards_by_category.setdefault(shard.category, []).append(shard)
+        for subcategory in shard.subcategories:
+            self._shards_by_subcategory.setdefault(subcategory, []).append(shard)
+
+    def _load(self, shards: Iterable[_Shard]) -> None:
+        """Parse any of ``shards`` not loaded yet."""
+
+        for shard in shards:
+            if shard.loaded:
+                continue
+            with open(shard.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self.add(TestCase(**json.loads(line)))
+            shard.loaded = True
+
+    def add(self, case: TestCase) -> None:
+        """Index a test case (replacing any case with the same id)."""
+
+        previous = self._by_id.get(case.id)
+        if previous is not None:
+            self._by_category[previous.category].remove(previous)
+            self._by_subcategory[previous.subcategory].remove(previous)
+
+        self._by_id[case.id] = case
+        self._by_category.setdefault(case.category, []).append(case)
+        self._by_subcategory.setdefault(case.subcategory, []).append(case)
+
+    def get(self, test_id: str) -> TestCase:
+        """Return the case with ``test_id``; raises KeyError if there is none."""
+
+        if not isinstance(test_id, str):
+            raise KeyError(f"Unknown test case: {test_id!r}")
+        case = self._by_id.get(test_id)
+        if case is None:
+            self._load(self._shards_by_prefix.get(id_prefix(test_id), ()))
+            case = self._by_id.get(test_id)
+            if case is None:
+                raise KeyError(f"Unknown test case: {test_id!r}")
+        return case
+
+    __getitem__ = get
+
+    def __contains__(self, test_id: str) -> bool:
+        try:
+            self.get(test_id)
+        except KeyError:
+            return False
+        return True
+
+    def by_category(self, category: str) -> List[TestCase]:
+        """Return the cases in ``category``, loading only that category's shards."""
+
+        self._load(self._shards_by_category.get(category, ()))
+        return list(self._by_category.get(category, ()))
+
+    def by_subcategory(self, subcategory: str) -> List[TestCase]:
+        """Return the cases in ``subcategory``, loading only the shards that list it."""
+
+        self._load(self._shards_by_subcategory.get(subcategory, ()))
+        return list(self._by_subcategory.get(subcategory, ()))
+
+    def categories(self) -> List[str]:
+        """Return every known category without loading any shard."""
+
+        return list(dict.fromkeys(list(self._shards_by_category) + list(self._by_category)))
+
+    def __iter__(self) -> Iterator[TestCase]:
+        """Iterate every case (loading all shards) in manifest category order."""
+
+        self._load(self._shards)
+        cases = [case for category in self.categories() for case in self._by_category[category]]
+        return iter(cases)
+
+    def __len__(self) -> int:
+        self._load(self._shards)
+        return len(self._by_id)
+
+
+class CaseList(list):
+    """
+    A snapshot list of a catalog's cases whose append, extend and insert
+    also add the case to the catalog, as suite.test_cases.append() did
+    before cases lived in a catalog. Removing a case from the list does
+    not remove it from the catalog.
+    """
+
+    def __init__(self, catalog: CaseCatalog):
+        super().__init__(catalog)
+        self.catalog = catalog
+
+    def append(self, case: TestCase) -> None:
+        self.catalog.add(case)
+        super().append(case)
+
+    def extend(self, cases: Iterable[TestCase]) -> None:
+        for case in cases:
+            self.append(case)
+
+    def insert(self, index: int, case: TestCase) -> None:
+        self.catalog.add(case)
+        super().insert(index, case)
+
+
+def write_catalog(cases: Iterable[TestCase], directory: str, shard_names: Optional[Dict[str, str]] = None) -> None:
+    """
+    Write cases to ``directory`` as one JSONL shard per category plus a manifest.
+    ``shard_names`` optionally maps category -> shard file name.
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    shards: Dict[str, Dict] = {}
+
+    for case in cases:
+        shard = shards.get(case.category)
+        if shard is None:
+            name = (shard_names or {}).get(case.category) or \
+                "".join(c if c.isalnum() else "_" for c in case.category.lower()) + ".jsonl"
+            shard = shards[case.category] = {"file": name, "category": case.category,
+                                             "id_prefix": id_prefix(case.id),
+                                             "subcategories": [], "cases": []}
+        if id_prefix(case.id) != shard["id_prefix"]:
+            raise ValueError(f"Case {case.id!r} does not share the id prefix "
+                             f"{shard['id_prefix']!r} of category {case.category!r}")
+        if case.subcategory not in shard["subcategories"]:
+            shard["subcategories"].append(case.subcategory)
+        shard["cases"].append(case)
+
+    for shard in shards.values():
+        with open(os.path.join(directory, shard["file"]), "w", encoding="utf-8") as f:
+            for case in shard.pop("cases"):
+                f.write(json.dumps(case.__dict__) + "\n")
+
+    with open(os.path.join(directory, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump({"shards": list(shards.values())}, f, indent=2)
+        f.write("\n")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Content-hash cache for classification results
+
+Scored responses are keyed by a SHA-256 of the normalized response text and
+the suite's rule version. Lookups go to a bounded in-memory LRU first and
+then to an optional SQLite file that persists across runs. When the rule
+version changes, the persistent tier is cleared when it is opened, so stale
+classifications are never served.
+"""
+
+import hashlib
+import json
+import sqlite3
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# (classification, indicators, severity)
+Scored = Tuple[str, List[str], str]
+
+
+def normalize_response(response: str) -> str:
+    """
+    Normalize a response for cache keying.
+
+    Classification only looks at the lowercased text and its word count,
+    and no rule phrase starts or ends with whitespace, so case and
+    surrounding whitespace never change the outcome.
+    """
+    return response.strip().lower()
+
+
+class ClassificationCache:
+    """Two-tier (LRU + optional SQLite) cache of scored responses."""
+
+    def __init__(self, rule_version: str, max_entries: int = 100_000, path: Optional[str] = None,
+                 commit_every: int = 1000):
+        self.rule_version = rule_version
+        self.max_entries = max_entries
+        self.path = path
+        self.commit_every = commit_every
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        self._memory: "OrderedDict[str, Scored]" = OrderedDict()
+        self._uncommitted = 0
+        self._db = self._open_db(path) if path else None
+
+    def _open_db(self, path: str) -> sqlite3.Connection:
+        db = sqlite3.connect(path)
+        db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        db.execute("CREATE TABLE IF NOT EXISTS entries ("
+                   "key TEXT PRIMARY KEY, classification TEXT, indicators TEXT, severity TEXT)")
+
+        row = db.execute("SELECT value FROM meta WHERE key = 'rule_version'").fetchone()
+        if row is None or row[0] != self.rule_version:
+            # Rules changed since this file was written: nothing in it is valid
+            db.execute("DELETE FROM entries")
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('rule_version', ?)",
+                       (self.rule_version,))
+        db.commit()
+        return db
+
+    def key(self, response: str) -> str:
+        """Return the cache key for ``response`` under the current rule version."""
+
+        digest = hashlib.sha256(self.rule_version.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(normalize_response(response).encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Scored]:
+        """Return the cached result for ``key``, or None on a miss."""
+
+        scored = self._memory.get(key)
+        if scored is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return scored[0], list(scored[1]), scored[2]
+
+        if self._db is not None:
+            row = self._db.execute("SELECT classification, indicators, severity FROM entries "
+                                   "WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                scored = (row[0], json.loads(row[1]), row[2])
+                self._remember(key, scored)
+                self.hits += 1
+                self.disk_hits += 1
+                return scored[0], list(scored[1]), scored[2]
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, scored: Scored) -> None:
+        """Store a freshly computed result in both tiers."""
+
+        classification, indicators, severity = scored
+        self._remember(key, (classification, tuple(indicators), severity))
+
+        if self._db is not None:
+            self._db.execute("INSERT OR REPLACE INTO entries (key, classification, indicators, severity) "
+                             "VALUES (?, ?, ?, ?)", (key, classification, json.dumps(indicators), severity))
+            self._uncommitted += 1
+            if self._uncommitted >= self.commit_every:
+                self.flush()
+
+    def _remember(self, key: str, scored: Scored) -> None:
+        self._memory[key] = scored
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def flush(self) -> None:
+        """Commit pending writes to the persistent tier."""
+
+        if self._db is not None and self._uncommitted:
+            self._db.commit()
+            self._uncommitted = 0
+
+    def close(self) -> None:
+        """Flush and close the persistent tier."""
+
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters and current tier sizes."""
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+            "memory_entries": len(self._memory),
+            "rule_version": self.rule_version
+        }
+
+    def __enter__(self) -> "ClassificationCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Thin client for the classification daemon
+
+Forwards {"test_id", "response"} JSONL records from stdin to a running
+classify_daemon over its Unix socket, in batches, and writes one scored
+record per line to stdout. Only the standard library is imported, so the
+client starts in a few milliseconds; the catalog and compiled rules stay
+warm in the daemon.
+
+Protocol: every message, in both directions, is a 4-byte big-endian length
+followed by that many bytes of UTF-8 JSON. Requests are
+{"op": "classify", "items": [{"test_id", "response"}, ...]}, {"op": "ping"},
+{"op": "stats"} or {"op": "shutdown"}; replies carry "ok" and either the
+result or an "error" message. Classify results hold one record per item;
+an item that cannot be scored (not an object, unknown test_id, response
+not a string) gets {"test_id", "error"} instead of failing the batch.
+
+The client only talks to a daemon run by the same user: it checks the
+peer's uid before sending anything.
+
+Usage:
+    cat captures.jsonl | python -m fabrication_detector.classify_client --autostart > scored.jsonl
+"""
+
+import argparse
+import json
+import os
+import socket
+import stat
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from . import module_command, module_environment
+
+HEADER = struct.Struct(">I")
+
+# Largest message either side accepts
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+
+def default_socket_path() -> str:
+    """
+    Per-user socket path: under $XDG_RUNTIME_DIR when it is set, otherwise
+    in an owner-only directory in the temp directory (see
+    ensure_private_directory), never directly in a world-writable one.
+    """
+
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, f"fabrication-detector-{os.getuid()}.sock")
+    return os.path.join(tempfile.gettempdir(), f"fabrication-detector-{os.getuid()}", "daemon.sock")
+
+
+def ensure_private_directory(directory: str) -> None:
+    """Create ``directory`` owner-only (0700), or check that an existing one is."""
+
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise RuntimeError(f"{directory} is not a directory only this user can access")
+
+
+class ProtocolError(Exception):
+    """The peer sent a malformed or oversized message, or closed mid-message."""
+
+
+def send_message(sock: socket.socket, message: Dict) -> None:
+    payload = json.dumps(message).encode("utf-8")
+    if len(payload) > MAX_MESSAGE_BYTES:
+        raise ProtocolError(f"Message of {len(payload)} bytes exceeds {MAX_MESSAGE_BYTES}")
+    sock.sendall(HEADER.pack(len(payload)) + payload)
+
+
+def recv_message(sock: socket.socket) -> Optional[Dict]:
+    """Read one message; None if the peer closed the connection between messages."""
+
+    header = _recv_exactly(sock, HEADER.size, allow_eof=True)
+    if header is None:
+        return None
+    (length,) = HEADER.unpack(header)
+    if length > MAX_MESSAGE_BYTES:
+        raise ProtocolError(f"Message of {length} bytes exceeds {MAX_MESSAGE_BYTES}")
+    try:
+        return json.loads(_recv_exactly(sock, length))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ProtocolError(f"Invalid message: {e}") from e
+
+
+def _recv_exactly(sock: socket.socket, size: int, allow_eof: bool = False) -> Optional[bytes]:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            if allow_eof and not buffer:
+                return None
+            raise ProtocolError("Connection closed mid-message")
+        buffer += chunk
+    return bytes(buffer)
+
+
+class DaemonClient:
+    """A persistent connection to the classification daemon."""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: Optional[float] = 30.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(self.socket_path)
+            self._check_peer()
+        except BaseException:
+            self.sock.close()
+            raise
+
+    def _check_peer(self) -> None:
+        """Refuse a daemon run by another user; it would see and answer every record."""
+
+        if hasattr(socket, "SO_PEERCRED"):
+            credentials = self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+            _, uid, _ = struct.unpack("3i", credentials)
+        else:
+            uid = os.stat(self.socket_path).st_uid
+        if uid != os.getuid():
+            raise RuntimeError(f"{self.socket_path} belongs to uid {uid}, not this user; refusing to connect")
+
+    def request(self, message: Dict) -> Dict:
+        send_message(self.sock, message)
+        reply = recv_message(self.sock)
+        if reply is None:
+            raise ProtocolError("Daemon closed the connection")
+        if not reply.get("ok"):
+            raise RuntimeError(f"Daemon error: {reply.get('error')}")
+        return reply
+
+    def classify(self, items: List[Dict]) -> List[Dict]:
+        """
+        Score [{"test_id", "response"}, ...]; returns one record per item, in
+        order. Records of items that could not be scored carry an "error".
+        """
+
+        return self.request({"op": "classify", "items": items})["results"]
+
+    def ping(self) -> Dict:
+        return self.request({"op": "ping"})
+
+    def stats(self) -> Dict:
+        return self.request({"op": "stats"})["stats"]
+
+    def shutdown(self) -> None:
+        self.request({"op": "shutdown"})
+
+    def close(self) -> None:
+        self.sock.close()
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def connect(socket_path: Optional[str] = None, autostart: bool = False,
+            start_timeout: float = 30.0) -> DaemonClient:
+    """Connect to the daemon, starting one in the background first if ``autostart``."""
+
+    socket_path = socket_path or default_socket_path()
+    try:
+        return DaemonClient(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        if not autostart:
+            raise
+
+    subprocess.Popen(module_command("classify_daemon") + ["--socket", socket_path], env=module_environment(),
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                     start_new_session=True)
+    deadline = time.monotonic() + start_timeout
+    while True:
+        try:
+            return DaemonClient(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.02)
+
+
+def _batches(stream, size: int) -> Iterator[List[Tuple[int, Union[Dict, ValueError]]]]:
+    """Batches of (line number, decoded record, or the ValueError for a line that is not JSON)."""
+
+    batch = []
+    for number, line in enumerate(stream, 1):
+        if line.strip():
+            try:
+                batch.append((number, json.loads(line)))
+            except ValueError as e:
+                batch.append((number, e))
+            if len(batch) >= size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def _classify_stream(client: DaemonClient, stream, out, batch_size: int) -> int:
+    """Write a scored record per input line; report bad lines on stderr. Returns their count."""
+
+    failed = 0
+    for batch in _batches(stream, batch_size):
+        valid = [(number, record) for number, record in batch if not isinstance(record, ValueError)]
+        for number, record in batch:
+            if isinstance(record, ValueError):
+                print(f"line {number}: invalid JSON: {record}", file=sys.stderr)
+                failed += 1
+
+        scored = client.classify([record for _, record in valid]) if valid else []
+        for (number, _), record in zip(valid, scored):
+            if "error" in record:
+                print(f"line {number}: {record['error']}", file=sys.stderr)
+                failed += 1
+                continue
+            out.write(json.dumps(record))
+            out.write("\n")
+    out.flush()
+    return failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Classify JSONL from stdin with the classification daemon")
+    parser.add_argument("--socket", default=None, help="Daemon socket path")
+    parser.add_argument("--batch-size", type=int, default=256, help="Records per request")
+    parser.add_argument("--autostart", action="store_true", help="Start the daemon if it is not running")
+    parser.add_argument("--stats", action="store_true", help="Print daemon stats instead of classifying")
+    parser.add_argument("--shutdown", action="store_true", help="Stop the daemon")
+    args = parser.parse_args(argv)
+
+    try:
+        client = connect(args.socket, args.autostart)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"No daemon listening on {args.socket or default_socket_path()} "
+              "(start fabrication-detector serve or pass --autostart)", file=sys.stderr)
+        return 2
+    except RuntimeError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        with client:
+            if args.stats:
+                print(json.dumps(client.stats(), indent=2))
+            elif args.shutdown:
+                client.shutdown()
+            elif _classify_stream(client, sys.stdin, sys.stdout, args.batch_size):
+                return 1
+    except (RuntimeError, ProtocolError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Long-running classification daemon
+
+Keeps one FabricationTestSuite (catalog and compiled rules) warm in memory
+and answers batched classify requests over a Unix domain socket, so CI jobs
+pay interpreter startup, imports and rule setup once instead of per job.
+The length-prefixed JSON protocol and the thin client live in
+classify_client.
+
+Each connection is served on its own thread and may send any number of
+requests; scoring itself is serialized on the one suite.
+
+Usage:
+    python -m fabrication_detector.classify_daemon --socket /run/user/1000/fabrication-detector.sock
+    cat captures.jsonl | python -m fabrication_detector.classify_client > scored.jsonl
+"""
+
+import argparse
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .classify_client import (ProtocolError, default_socket_path, ensure_private_directory, recv_message,
+                             send_message)
+from .fabrication_test_suite import FabricationTestSuite
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        daemon = self.server.daemon_state
+        while True:
+            try:
+                request = recv_message(self.request)
+            except (ProtocolError, OSError):
+                return
+            if request is None:
+                return
+            send_message(self.request, daemon.handle(request))
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class ClassificationDaemon:
+    """Serves classify requests for one warm suite."""
+
+    def __init__(self, suite: Optional[FabricationTestSuite] = None, socket_path: Optional[str] = None):
+        if suite is None:
+            suite = FabricationTestSuite()
+            suite.load_test_cases()
+        self.suite = suite
+        self.socket_path = socket_path or default_socket_path()
+        self.started = time.time()
+        self.requests = 0
+        self.classified = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+
+    def handle(self, request: Dict) -> Dict:
+        """Answer one decoded request."""
+
+        op = request.get("op") if isinstance(request, dict) else None
+        try:
+            if op == "classify":
+                return {"ok": True, "results": self.classify(request.get("items") or [])}
+            if op == "ping":
+                return {"ok": True, "pid": os.getpid(), "rule_version": self.suite.rule_version()}
+            if op == "stats":
+                return {"ok": True, "stats": self.stats()}
+            if op == "shutdown":
+                threading.Thread(target=self.shutdown, daemon=True).start()
+                return {"ok": True}
+            return {"ok": False, "error": f"Unknown op: {op!r}"}
+        except (KeyError, TypeError, ValueError) as e:
+            return {"ok": False, "error": str(e) or type(e).__name__}
+
+    def classify(self, items: List[Dict]) -> List[Dict]:
+        """
+        Score [{"test_id", "response"}, ...] with the warm suite. An item that
+        cannot be scored gets {"test_id", "error"}; the rest are still scored.
+        """
+
+        if not isinstance(items, list):
+            raise ValueError("items must be a list")
+        records: List[Optional[Dict]] = []
+        pairs = []
+        for position, item in enumerate(items):
+            try:
+                pairs.append((position, self._resolve(item)))
+                records.append(None)
+            except ValueError as e:
+                test_id = item.get("test_id") if isinstance(item, dict) else None
+                records.append({"test_id": test_id, "error": str(e)})
+
+        with self._lock:
+            start = time.perf_counter()
+            scored = [self.suite._score(test_case, response) for _, (test_case, response) in pairs]
+            self.busy_seconds += time.perf_counter() - start
+            self.requests += 1
+            self.classified += len(scored)
+
+        for (position, (test_case, _)), (classification, indicators, severity) in zip(pairs, scored):
+            records[position] = {"test_id": test_case.id, "classification": classification,
+                                 "fabrication_indicators": indicators, "severity": severity}
+        return records
+
+    def _resolve(self, item: Dict):
+        """(test case, response) for one classify item; ValueError if it is malformed."""
+
+        if not isinstance(item, dict):
+            raise ValueError("item is not an object")
+        test_id, response = item.get("test_id"), item.get("response")
+        if not isinstance(test_id, str) or test_id not in self.suite.catalog:
+            raise ValueError(f"unknown test_id {test_id!r}")
+        if not isinstance(response, str):
+            raise ValueError("response must be a string")
+        return self.suite.catalog.get(test_id), response
+
+    def stats(self) -> Dict:
+        return {
+            "pid": os.getpid(),
+            "uptime_seconds": time.time() - self.started,
+            "requests": self.requests,
+            "classified": self.classified,
+            "mean_classify_ms": self.busy_seconds / self.requests * 1000 if self.requests else 0.0,
+            "rule_version": self.suite.rule_version(),
+            "cache": self.suite.cache.stats() if self.suite.cache is not None else None
+        }
+
+    def serve_forever(self) -> None:
+        """Bind the socket (owner-only) and serve until shutdown()."""
+
+        if self.socket_path == default_socket_path():
+            ensure_private_directory(os.path.dirname(self.socket_path))
+        self._remove_stale_socket()
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _Server(self.socket_path, _Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.daemon_state = self
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+    def _remove_stale_socket(self) -> None:
+        try:
+            mode = os.lstat(self.socket_path).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise RuntimeError(f"{self.socket_path} exists and is not a socket")
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            # Left behind by a daemon that did not exit cleanly
+            os.unlink(self.socket_path)
+        else:
+            raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+        finally:
+            probe.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve fabrication classification over a Unix socket")
+    parser.add_argument("--socket", default=None, help=f"Socket path (default: {default_socket_path()})")
+    parser.add_argument("--cases", default=None, help="Case catalog directory (default: bundled cases/)")
+    parser.add_argument("--cache", type=int, default=100_000,
+                        help="In-memory classification cache entries (0 to disable)")
+    args = parser.parse_args(argv)
+
+    suite = FabricationTestSuite()
+    suite.load_test_cases(args.cases)
+    if args.cache:
+        suite.enable_cache(max_entries=args.cache)
+
+    daemon = ClassificationDaemon(suite, args.socket)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory storage for large numbers of test results
+
+CompactResultStore keeps results in parallel typed arrays instead of one
+TestResult object per result: test id, classification, severity and notes as
+small integer codes, indicators as a bitset over the suite's fixed indicator
+vocabulary, and timestamps as integer microseconds. TestResult objects and
+their indicator strings are only rebuilt when a result is read back.
+"""
+
+import math
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+from .fabrication_models import TestResult
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def indicator_vocabulary(suite) -> List[str]:
+    """Every indicator string classify_response can produce, in the order it emits them."""
+
+    return ([f"Makes specific claim: '{claim}'" for claim in suite.SPECIFIC_CLAIMS] +
+            [f"Uses confident language: '{confidence}'" for confidence in suite.CONFIDENT_LANGUAGE] +
+            ["Provides detailed information despite access limitations"])
+
+
+class _Codes:
+    """Dense integer codes for a small set of repeated strings."""
+
+    def __init__(self, values: Sequence[str] = ()):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+        for value in values:
+            self.encode(value)
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class CompactResultStore:
+    """
+    A list-like store of TestResults held as typed columns. Results can be
+    appended or replaced in place, not removed.
+
+    ``keep_responses=False`` drops the response text, which is by far the
+    largest field; rebuilt results then carry an empty ``ai_response``.
+    """
+
+    def __init__(self, vocabulary: Sequence[str], keep_responses: bool = True):
+        self.keep_responses = keep_responses
+
+        self._test_ids = _Codes()
+        self._classifications = _Codes(("honest", "partial", "fabricated", "inconsistent"))
+        self._severities = _Codes(("none", "low", "medium", "high", "critical"))
+        self._notes = _Codes(("",))
+        self._indicators = list(vocabulary)
+        self._indicator_bits = {indicator: 1 << bit for bit, indicator in enumerate(self._indicators)}
+
+        self._test_id = array("I")
+        self._classification = array("B")
+        self._severity = array("B")
+        self._note = array("I")
+        # Larger vocabularies fall back to a list of Python ints
+        self._bitset = array("Q") if len(self._indicators) <= 64 else []
+        self._timestamp = array("q")
+        self._confidence = array("d")
+        # -1 for results outside any near-duplicate cluster
+        self._cluster = array("q")
+        self._responses: List[str] = []
+
+        # Rare values that do not fit the columns, keyed by row
+        self._extra_indicators: Dict[int, List[str]] = {}
+        self._raw_timestamps: Dict[int, str] = {}
+
+    def append(self, result: TestResult) -> None:
+        """Store ``result`` in compact form."""
+
+        row = len(self._test_id)
+        self._test_id.append(self._test_ids.encode(result.test_id))
+        self._classification.append(self._classifications.encode(result.classification))
+        self._severity.append(self._severities.encode(result.severity))
+        self._note.append(self._notes.encode(result.verification_notes))
+        self._confidence.append(math.nan if result.confidence_score is None else result.confidence_score)
+        self._bitset.append(self._encode_indicators(row, result.fabrication_indicators))
+        self._timestamp.append(self._encode_timestamp(row, result.timestamp))
+        self._cluster.append(-1 if result.cluster_id is None else result.cluster_id)
+
+        if self.keep_responses:
+            self._responses.append(result.ai_response)
+
+    def __setitem__(self, row: int, result: TestResult) -> None:
+        """Replace the result stored at ``row``."""
+
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("result index out of range")
+
+        self._extra_indicators.pop(row, None)
+        self._raw_timestamps.pop(row, None)
+        self._test_id[row] = self._test_ids.encode(result.test_id)
+        self._classification[row] = self._classifications.encode(result.classification)
+        self._severity[row] = self._severities.encode(result.severity)
+        self._note[row] = self._notes.encode(result.verification_notes)
+        self._confidence[row] = math.nan if result.confidence_score is None else result.confidence_score
+        self._bitset[row] = self._encode_indicators(row, result.fabrication_indicators)
+        self._timestamp[row] = self._encode_timestamp(row, result.timestamp)
+        self._cluster[row] = -1 if result.cluster_id is None else result.cluster_id
+
+        if self.keep_responses:
+            self._responses[row] = result.ai_response
+
+    def _encode_indicators(self, row: int, indicators: List[str]) -> int:
+        bits = 0
+        for indicator in indicators:
+            bit = self._indicator_bits.get(indicator)
+            if bit is None or bits & bit or bits >> bit.bit_length():
+                # Unknown, repeated or out-of-vocabulary-order indicators
+                # cannot be rebuilt from a bitset; keep this row's list as is.
+                self._extra_indicators[row] = list(indicators)
+                return 0
+            bits |= bit
+        return bits
+
+    def _encode_timestamp(self, row: int, timestamp: str) -> int:
+        try:
+            moment = datetime.fromisoformat(timestamp)
+            if moment.tzinfo is not None or moment.isoformat() != timestamp:
+                raise ValueError(timestamp)
+            return (moment - _EPOCH) // _MICROSECOND
+        except ValueError:
+            self._raw_timestamps[row] = timestamp
+            return 0
+
+    def extend(self, results) -> None:
+        for result in results:
+            self.append(result)
+
+    def __len__(self) -> int:
+        return len(self._test_id)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[TestResult, List[TestResult]]:
+        if isinstance(index, slice):
+            return [self._rebuild(row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("result index out of range")
+        return self._rebuild(index)
+
+    def __iter__(self) -> Iterator[TestResult]:
+        for row in range(len(self)):
+            yield self._rebuild(row)
+
+    def indicators(self, row: int) -> List[str]:
+        """Rebuild the indicator strings for one row."""
+
+        extra = self._extra_indicators.get(row)
+        if extra is not None:
+            return list(extra)
+        bits = self._bitset[row]
+        found = []
+        while bits:
+            low = bits & -bits
+            found.append(self._indicators[low.bit_length() - 1])
+            bits ^= low
+        return found
+
+    def _rebuild(self, row: int) -> TestResult:
+        timestamp = self._raw_timestamps.get(row)
+        if timestamp is None:
+            timestamp = (_EPOCH + self._timestamp[row] * _MICROSECOND).isoformat()
+        confidence: Optional[float] = self._confidence[row]
+        return TestResult(
+            test_id=self._test_ids.values[self._test_id[row]],
+            timestamp=timestamp,
+            ai_response=self._responses[row] if self.keep_responses else "",
+            classification=self._classifications.values[self._classification[row]],
+            confidence_score=None if math.isnan(confidence) else confidence,
+            fabrication_indicators=self.indicators(row),
+            verification_notes=self._notes.values[self._note[row]],
+            severity=self._severities.values[self._severity[row]],
+            cluster_id=None if self._cluster[row] < 0 else self._cluster[row]
+        )
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the fixed-width columns (excluding responses)."""
+
+        columns = [self._test_id, self._classification, self._severity, self._note,
+                   self._timestamp, self._confidence, self._cluster]
+        if isinstance(self._bitset, array):
+            columns.append(self._bitset)
+        return sum(column.itemsize * len(column) for column in columns)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Command-line entry point for fabrication detection
+
+``fabrication-detector scan`` classifies captured responses from files or
+directories: JSONL files (optionally .gz) of {"test_id", "response"}
+records, and .txt files holding one response each, named after the test id
+(``music_001.txt``, ``music_001.sample2.txt``). Directories are walked
+recursively in sorted order. Results are summarized, rendered as a report or
+exported, and can also be appended to a results_store database.
+
+The other subcommands hand their arguments to the existing module CLIs. Only
+argparse is imported up front; the suite, SQLite, process pools, NumPy and
+asyncio are imported by the subcommand that needs them, so ``--help`` and
+small scans start quickly (tracked by the startup stages in benchmark_suite).
+
+Usage:
+    fabrication-detector scan captures/ --format report -o report.md
+    fabrication-detector scan captures.jsonl.gz --workers 4 --cache-file cache.db --store runs.db
+    fabrication-detector run --base-url http://localhost:8000/v1 --model my-model
+"""
+
+import argparse
+import importlib
+import os
+import sys
+from typing import Iterable, Iterator, List, Optional
+
+# Subcommands served by another module's main(argv)
+DELEGATED_COMMANDS = {
+    "run": ("async_runner", "Send test prompts to an AI endpoint and classify the replies"),
+    "shard": ("sharded_runs", "Map-reduce sharded runs"),
+    "serve": ("classify_daemon", "Serve classification over a Unix socket"),
+    "classify": ("classify_client", "Classify JSONL from stdin with a running daemon"),
+    "bench": ("benchmark_suite", "Benchmark the detection pipeline"),
+}
+
+SCAN_FORMATS = ("summary", "report", "json", "jsonl", "columnar", "sqlite")
+
+# File suffixes picked up when scanning a directory
+RESPONSE_SUFFIXES = (".jsonl", ".jsonl.gz", ".txt")
+
+
+def iter_input_files(paths: Iterable[str]) -> Iterator[str]:
+    """Expand directories into their response files; other paths pass through."""
+
+    for path in paths:
+        if path == "-" or not os.path.isdir(path):
+            yield path
+            continue
+        for root, directories, files in os.walk(path):
+            directories.sort()
+            for name in sorted(files):
+                if name.endswith(RESPONSE_SUFFIXES):
+                    yield os.path.join(root, name)
+
+
+def read_pairs(paths: Iterable[str], catalog) -> Iterator:
+    """Yield (test case, response) for every response in the given files."""
+
+    from .stream_pipeline import open_input, read_records, resolve_cases
+
+    for path in iter_input_files(paths):
+        if path.endswith(".txt"):
+            test_id = os.path.basename(path).split(".", 1)[0]
+            if test_id not in catalog:
+                raise ValueError(f"{path}: unknown test_id {test_id!r}")
+            with open(path, "r", encoding="utf-8") as f:
+                yield catalog.get(test_id), f.read()
+            continue
+
+        source = open_input(path)
+        try:
+            yield from resolve_cases(read_records(source), catalog)
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}") from None
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+
+def scan(args: argparse.Namespace) -> int:
+    to_stdout = args.output in (None, "-")
+    if args.output == "-" and args.format in ("json", "columnar", "sqlite"):
+        raise ValueError(f"--format {args.format} writes a file; pass -o FILE")
+
+    from .fabrication_test_suite import FabricationTestSuite
+
+    suite = FabricationTestSuite()
+    suite.load_test_cases(args.cases)
+    if args.cache or args.cache_file:
+        suite.enable_cache(max_entries=args.cache or 100_000, path=args.cache_file)
+
+    try:
+        pairs = read_pairs(args.paths, suite.catalog)
+        if args.dedup is not None:
+            suite.run_deduplicated(pairs, threshold=args.dedup)
+        else:
+            suite.run_batch(pairs, workers=args.workers, executor=args.executor)
+    finally:
+        if suite.cache is not None:
+            suite.cache.close()
+
+    if args.store:
+        from .results_store import ResultsStore
+        with ResultsStore(args.store) as store:
+            run_id = store.save_suite(suite, name=args.run_name)
+        print(f"Stored run {run_id} in {args.store}", file=sys.stderr)
+
+    if args.format in ("summary", "report", "jsonl") and to_stdout:
+        write_scan_output(suite, args.format, sys.stdout)
+    elif args.format in ("summary", "report"):
+        with open(args.output, "w", encoding="utf-8") as f:
+            write_scan_output(suite, args.format, f)
+    else:
+        # json, columnar and sqlite default to a timestamped file name
+        print(f"Results: {suite.export_results(args.output, format=args.format)}", file=sys.stderr)
+    return 0
+
+
+def write_scan_output(suite, format: str, stream) -> None:
+    if format == "report":
+        suite.write_report(stream)
+    elif format == "jsonl":
+        from .result_export import write_jsonl
+        write_jsonl(suite.results, stream)
+    else:
+        write_summary(suite, stream)
+
+
+def write_summary(suite, stream) -> None:
+    """A few plain-text lines: totals, rate per category and severity counts."""
+
+    patterns = suite.analyze_patterns()
+    stream.write(f"Scanned {len(suite.results)} responses, "
+                 f"fabrication rate {patterns['fabrication_rate']:.2%}\n")
+    for category, stats in patterns["by_category"].items():
+        stream.write(f"  {category}: {stats['fabricated']}/{stats['total']} fabricated\n")
+    severities = ", ".join(f"{severity} {count}" for severity, count in patterns["by_severity"].items())
+    stream.write(f"Severity: {severities or 'none'}\n")
+
+
+def list_cases(args: argparse.Namespace) -> int:
+    from .case_catalog import CaseCatalog, DEFAULT_CATALOG_DIR
+
+    for case in CaseCatalog(args.cases or DEFAULT_CATALOG_DIR):
+        print(f"{case.id}\t{case.category}\t{case.subcategory}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="fabrication-detector",
+                                     description="Detect fabricated answers in captured AI responses")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    scan_parser = commands.add_parser("scan", help="Classify response files or directories")
+    scan_parser.add_argument("paths", nargs="+",
+                             help="JSONL(.gz) files, <test_id>.txt files or directories ('-' for stdin)")
+    scan_parser.add_argument("-f", "--format", choices=SCAN_FORMATS, default="summary",
+                             help="Output format (default: summary)")
+    scan_parser.add_argument("-o", "--output", default=None,
+                             help="Output file (default: stdout for summary, report and jsonl)")
+    scan_parser.add_argument("--workers", type=int, default=1,
+                             help="Classification workers (default: 1, in-process)")
+    scan_parser.add_argument("--executor", choices=("process", "thread", "vectorized"), default="process",
+                             help="Process or thread pool when --workers > 1, or NumPy vectorized scoring")
+    scan_parser.add_argument("--cache", type=int, default=0,
+                             help="In-memory classification cache entries (default: off)")
+    scan_parser.add_argument("--cache-file", default=None,
+                             help="Persistent SQLite classification cache shared across scans")
+    scan_parser.add_argument("--store", default=None, help="Also append the results to this results database")
+    scan_parser.add_argument("--run-name", default=None, help="Run name recorded with --store")
+    scan_parser.add_argument("--dedup", type=float, nargs="?", const=0.9, default=None, metavar="THRESHOLD",
+                             help="Classify one response per near-duplicate group (default threshold: 0.9)")
+    scan_parser.add_argument("--cases", default=None, help="Case catalog directory (default: bundled cases/)")
+    scan_parser.set_defaults(handler=scan)
+
+    cases_parser = commands.add_parser("cases", help="List the test cases in the catalog")
+    cases_parser.add_argument("--cases", default=None, help="Case catalog directory (default: bundled cases/)")
+    cases_parser.set_defaults(handler=list_cases)
+
+    for name, (_, description) in DELEGATED_COMMANDS.items():
+        commands.add_parser(name, help=f"{description} (see {name} --help)", add_help=False)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in DELEGATED_COMMANDS:
+        module = importlib.import_module(f".{DELEGATED_COMMANDS[argv[0]][0]}", __package__)
+        return module.main(argv[1:]) or 0
+
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except BrokenPipeError:
+        # Output piped into head or similar; silence the flush at exit too
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (OSError, ValueError) as e:
+        print(f"fabrication-detector: error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Data records shared across the fabrication detection modules.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+@dataclass
+class TestCase:
+    """Represents a single test case for fabrication detection."""
+    id: str
+    category: str
+    subcategory: str
+    input_prompt: str
+    url: str
+    expected_behavior: str
+    risk_description: str
+    verification_method: str
+
+@dataclass
+class TestResult:
+    """Stores the result of a fabrication detection test."""
+    test_id: str
+    timestamp: str
+    ai_response: str
+    classification: str  # honest, partial, fabricated, inconsistent
+    confidence_score: Optional[float]
+    fabrication_indicators: List[str]
+    verification_notes: str
+    severity: str  # low, medium, high, critical
+    cluster_id: Optional[int] = None  # near-duplicate group, see near_duplicates
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Space-Saving heavy-hitters sketch
+
+Tracks the most frequent keys of an unbounded stream in a fixed number of
+counters. Any key whose true count exceeds total / capacity is guaranteed to
+be tracked, and each tracked count overestimates the true count by at most
+its recorded error. Used by PatternAggregates to bound indicator counts.
+"""
+
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+
+class SpaceSaving:
+    """Space-Saving top-k sketch over string keys."""
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        # One (count, key) entry per tracked key; a count may lag behind
+        # self.counts and is refreshed when it reaches the top
+        self._heap: List[Tuple[int, str]] = []
+
+    def add(self, key: str, count: int = 1) -> None:
+        counts = self.counts
+        if key in counts:
+            counts[key] += count
+            return
+
+        if len(counts) < self.capacity:
+            counts[key] = count
+            self.errors[key] = 0
+            heapq.heappush(self._heap, (count, key))
+            return
+
+        # Replace the smallest counter; the newcomer inherits its count as error
+        minimum, victim = self._pop_minimum()
+        del counts[victim]
+        del self.errors[victim]
+        counts[key] = minimum + count
+        self.errors[key] = minimum
+        heapq.heappush(self._heap, (minimum + count, key))
+
+    def _pop_minimum(self) -> Tuple[int, str]:
+        heap = self._heap
+        while True:
+            count, key = heapq.heappop(heap)
+            current = self.counts[key]
+            if current == count:
+                return count, key
+            heapq.heappush(heap, (current, key))
+
+    def merge(self, other: "SpaceSaving") -> None:
+        """Fold another sketch in, keeping the ``capacity`` largest counters."""
+
+        counts = dict(self.counts)
+        errors = dict(self.errors)
+        # A key missing from one side may have had up to that side's minimum
+        own_floor = min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+        other_floor = min(other.counts.values()) if len(other.counts) >= other.capacity else 0
+        for key in counts:
+            if key not in other.counts:
+                counts[key] += other_floor
+                errors[key] += other_floor
+        for key, count in other.counts.items():
+            if key in counts:
+                counts[key] += count
+                errors[key] += other.errors[key]
+            else:
+                counts[key] = count + own_floor
+                errors[key] = other.errors[key] + own_floor
+
+        kept = sorted(counts, key=counts.get, reverse=True)[:self.capacity]
+        self.counts = {key: counts[key] for key in kept}
+        self.errors = {key: errors[key] for key in kept}
+        self._heap = [(count, key) for key, count in self.counts.items()]
+        heapq.heapify(self._heap)
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """The ``n`` largest (key, estimated count) pairs, largest first."""
+
+        ranked = sorted(self.counts.items(), key=lambda x: x[1], reverse=True)
+        return ranked if n is None else ranked[:n]
+
+    def to_dict(self) -> Dict:
+        return {"capacity": self.capacity, "counts": dict(self.counts), "errors": dict(self.errors)}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SpaceSaving":
+        sketch = cls(data["capacity"])
+        sketch.counts = dict(data["counts"])
+        sketch.errors = dict(data["errors"])
+        sketch._heap = [(count, key) for key, count in sketch.counts.items()]
+        heapq.heapify(sketch._heap)
+        return sketch
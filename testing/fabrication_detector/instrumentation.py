@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing and counters for FabricationTestSuite
+
+Instrumentation wraps a suite's stage methods (run_test, classify_response,
+calculate_severity, analyze_patterns, generate_report, export_results) on
+that suite instance only. While attached, each call records its count,
+cumulative time, latency histogram, a window of recent latencies for
+percentiles, and the number of items it processed. Detaching removes the
+wrappers, so a suite without instrumentation runs the plain methods with no
+overhead at all.
+
+Stats are available as a dict or in Prometheus text exposition format, and
+an optional callback(stage, seconds, items) receives every call for custom
+profilers.
+"""
+
+import functools
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+# Instrumented stage -> how many items one call processed
+STAGE_ITEMS: Dict[str, Callable] = {
+    "run_test": lambda suite: 1,
+    "classify_response": lambda suite: 1,
+    "calculate_severity": lambda suite: 1,
+    "analyze_patterns": lambda suite: len(suite.results),
+    "generate_report": lambda suite: len(suite.results),
+    "export_results": lambda suite: len(suite.results),
+}
+
+# Histogram bucket upper bounds in seconds (Prometheus "le" labels)
+LATENCY_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+
+class StageStats:
+    """Counters for one instrumented stage."""
+
+    def __init__(self, window: int):
+        self.calls = 0
+        self.items = 0
+        self.total_seconds = 0.0
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.recent = deque(maxlen=window)
+
+    def record(self, seconds: float, items: int) -> None:
+        self.calls += 1
+        self.items += items
+        self.total_seconds += seconds
+        self.recent.append(seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+    def as_dict(self) -> Dict:
+        recent = sorted(self.recent)
+        return {
+            "calls": self.calls,
+            "items": self.items,
+            "total_seconds": self.total_seconds,
+            "items_per_second": self.items / self.total_seconds if self.total_seconds > 0 else 0.0,
+            "latency_ms": {
+                "mean": self.total_seconds / self.calls * 1000 if self.calls else 0.0,
+                "p50": _percentile(recent, 0.50) * 1000,
+                "p95": _percentile(recent, 0.95) * 1000,
+                "p99": _percentile(recent, 0.99) * 1000,
+            },
+        }
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class Instrumentation:
+    """
+    Collects per-stage stats for one suite.
+
+    ``window`` is how many recent latencies per stage are kept for
+    percentiles; ``callback`` is called as callback(stage, seconds, items)
+    after every instrumented call.
+    """
+
+    def __init__(self, window: int = 4096, callback: Optional[Callable[[str, float, int], None]] = None):
+        self.window = window
+        self.callback = callback
+        self.stages: Dict[str, StageStats] = {stage: StageStats(window) for stage in STAGE_ITEMS}
+        self._suite = None
+
+    def attach(self, suite) -> None:
+        """Wrap the suite's stage methods on the instance."""
+
+        if self._suite is not None:
+            raise RuntimeError("Instrumentation is already attached to a suite")
+        self._suite = suite
+        for stage in STAGE_ITEMS:
+            setattr(suite, stage, self._wrap(suite, stage, getattr(suite, stage)))
+
+    def detach(self) -> None:
+        """Remove the wrappers, restoring the class methods."""
+
+        if self._suite is None:
+            return
+        for stage in STAGE_ITEMS:
+            self._suite.__dict__.pop(stage, None)
+        self._suite = None
+
+    def _wrap(self, suite, stage: str, method: Callable) -> Callable:
+        count_items = STAGE_ITEMS[stage]
+
+        @functools.wraps(method)
+        def instrumented(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                items = count_items(suite)
+                self.stages[stage].record(seconds, items)
+                if self.callback is not None:
+                    self.callback(stage, seconds, items)
+
+        return instrumented
+
+    def reset(self) -> None:
+        """Clear all counters."""
+
+        self.stages = {stage: StageStats(self.window) for stage in STAGE_ITEMS}
+
+    def as_dict(self) -> Dict:
+        """Return every stage's stats."""
+
+        return {stage: stats.as_dict() for stage, stats in self.stages.items()}
+
+    def to_prometheus(self, prefix: str = "fabrication") -> str:
+        """Render the stats in Prometheus text exposition format."""
+
+        lines = [
+            f"# HELP {prefix}_stage_calls_total Calls per pipeline stage.",
+            f"# TYPE {prefix}_stage_calls_total counter",
+        ]
+        lines += [f'{prefix}_stage_calls_total{{stage="{stage}"}} {stats.calls}'
+                  for stage, stats in self.stages.items()]
+
+        lines += [
+            f"# HELP {prefix}_stage_items_total Items processed per pipeline stage.",
+            f"# TYPE {prefix}_stage_items_total counter",
+        ]
+        lines += [f'{prefix}_stage_items_total{{stage="{stage}"}} {stats.items}'
+                  for stage, stats in self.stages.items()]
+
+        lines += [
+            f"# HELP {prefix}_stage_seconds Latency per pipeline stage call.",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        for stage, stats in self.stages.items():
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, stats.bucket_counts):
+                cumulative += count
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {stats.calls}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {stats.total_seconds}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {stats.calls}')
+
+        return "\n".join(lines) + "\n"
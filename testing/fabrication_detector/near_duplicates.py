@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate grouping of AI responses
+
+Captured responses are often near-identical: the same refusal naming a
+different song, or the same invented summary with small wording changes.
+NearDuplicateIndex assigns each response to a cluster so only the first
+response of each cluster (its representative) needs classifying.
+
+Responses are compared by the Jaccard similarity of their word 3-shingles,
+estimated with one-permutation MinHash signatures. Signatures are split into
+LSH bands, so a new response is only compared with representatives that
+share at least one band. Identical responses (after case and whitespace
+normalization) skip fingerprinting altogether.
+
+Usage:
+    index = NearDuplicateIndex(threshold=0.9)
+    cluster_id, is_new = index.assign(response)
+"""
+
+import hashlib
+import re
+from operator import eq
+from typing import Dict, List, Optional, Tuple
+
+_WORD = re.compile(r"\w+")
+_MASK64 = (1 << 64) - 1
+# Larger than any 64-bit slot value
+_EMPTY = 1 << 80
+
+
+class NearDuplicateIndex:
+    """
+    Leader clustering of responses by estimated Jaccard similarity.
+
+    ``num_perm`` signature slots are split into ``bands`` LSH bands; a pair
+    whose similarity is at or above ``threshold`` is found with high
+    probability and then confirmed against the signature estimate.
+    """
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 64, bands: int = 8, shingle_size: int = 3):
+        if num_perm & (num_perm - 1) or num_perm % bands:
+            raise ValueError("num_perm must be a power of two divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        self._slot_shift = 64 - (num_perm.bit_length() - 1)
+        self._word_hashes: Dict[str, int] = {}
+
+        # Per cluster: representative signature, member count and text excerpt
+        self.signatures: List[Tuple[int, ...]] = []
+        self.sizes: List[int] = []
+        self.excerpts: List[str] = []
+        self._exact: Dict[str, int] = {}
+        self._buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(bands)]
+
+    def assign(self, response: str) -> Tuple[int, bool]:
+        """Return (cluster id, True if this response starts a new cluster)."""
+
+        normalized = " ".join(response.lower().split())
+        cluster = self._exact.get(normalized)
+        if cluster is not None:
+            self.sizes[cluster] += 1
+            return cluster, False
+
+        signature = self.signature(normalized)
+        cluster = self._find(signature)
+        if cluster is not None:
+            self.sizes[cluster] += 1
+            return cluster, False
+
+        cluster = len(self.signatures)
+        self.signatures.append(signature)
+        self.sizes.append(1)
+        self.excerpts.append(response[:200])
+        self._exact[normalized] = cluster
+        rows = self.rows
+        for band, buckets in enumerate(self._buckets):
+            buckets.setdefault(signature[band * rows:(band + 1) * rows], []).append(cluster)
+        return cluster, True
+
+    def _find(self, signature: Tuple[int, ...]) -> Optional[int]:
+        rows = self.rows
+        needed = self.threshold * self.num_perm
+        checked = set()
+        for band, buckets in enumerate(self._buckets):
+            for cluster in buckets.get(signature[band * rows:(band + 1) * rows], ()):
+                if cluster in checked:
+                    continue
+                checked.add(cluster)
+                if sum(map(eq, signature, self.signatures[cluster])) >= needed:
+                    return cluster
+        return None
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """One-permutation MinHash signature of an already lowercased text."""
+
+        words = _WORD.findall(text)
+        cache = self._word_hashes
+        hashes = []
+        for word in words:
+            value = cache.get(word)
+            if value is None:
+                value = cache[word] = int.from_bytes(
+                    hashlib.blake2b(word.encode("utf-8", "surrogatepass"), digest_size=8).digest(), "little")
+            hashes.append(value)
+
+        if len(hashes) >= 3 and self.shingle_size == 3:
+            shingles = [(a * 0x9E3779B97F4A7C15) ^ (b * 0xC2B2AE3D27D4EB4F) ^ c
+                        for a, b, c in zip(hashes, hashes[1:], hashes[2:])]
+        elif len(hashes) >= self.shingle_size:
+            size = self.shingle_size
+            shingles = []
+            for i in range(len(hashes) - size + 1):
+                value = 0
+                for word_hash in hashes[i:i + size]:
+                    value = (value * 0x9E3779B97F4A7C15) ^ word_hash
+                shingles.append(value)
+        else:
+            shingles = [sum(hashes)]
+
+        # The top bits of each mixed shingle hash pick its slot; comparing
+        # whole values within a slot is the same as comparing the low bits
+        shift = self._slot_shift
+        slots = [_EMPTY] * self.num_perm
+        for value in shingles:
+            value &= _MASK64
+            value ^= value >> 31
+            value = (value * 0xBF58476D1CE4E5B9) & _MASK64
+            value ^= value >> 29
+            slot = value >> shift
+            if value < slots[slot]:
+                slots[slot] = value
+
+        # Densify: an empty slot borrows the next filled slot's value
+        if _EMPTY in slots:
+            filled = [i for i, value in enumerate(slots) if value != _EMPTY]
+            if not filled:
+                return tuple(slots)
+            for i, value in enumerate(slots):
+                if value == _EMPTY:
+                    donor = next((j for j in filled if j > i), filled[0])
+                    slots[i] = slots[donor] + ((donor - i) % self.num_perm << 64)
+        return tuple(slots)
+
+    def largest(self, n: int = 10) -> List[Dict]:
+        """The ``n`` largest clusters: id, size and an excerpt of the representative."""
+
+        ranked = sorted(range(len(self.sizes)), key=self.sizes.__getitem__, reverse=True)[:n]
+        return [{"cluster_id": cluster, "size": self.sizes[cluster], "excerpt": self.excerpts[cluster]}
+                for cluster in ranked]
+
+    def __len__(self) -> int:
+        return len(self.sizes)
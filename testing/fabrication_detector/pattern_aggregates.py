@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Incremental fabrication pattern aggregates
+
+Keeps the counters behind FabricationTestSuite.analyze_patterns() up to date
+as each result is recorded, so a patterns snapshot costs
+O(categories + indicators) instead of a rescan of every stored result.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .heavy_hitters import SpaceSaving
+
+# Classifications that count towards the fabrication rate
+FABRICATED_CLASSIFICATIONS = ("fabricated", "partial")
+
+# Where a severity or indicator first appears: (row, position in that row's indicators)
+Place = Tuple[int, int]
+
+
+class PatternAggregates:
+    """
+    Running per-category, per-severity and per-indicator counters.
+
+    With ``indicator_capacity`` set, indicator counts are kept in a
+    Space-Saving sketch of that many counters instead of an unbounded dict,
+    so ``common_indicators`` becomes an approximate top list.
+    """
+
+    def __init__(self, indicator_capacity: Optional[int] = None):
+        self.total = 0
+        self.fabricated = 0
+        # Dicts keep first-seen order, matching what a full rescan produces
+        self.by_category: Dict[str, Dict[str, int]] = {}
+        self.by_severity: Dict[str, int] = {}
+        self.indicator_sketch = SpaceSaving(indicator_capacity) if indicator_capacity else None
+        self.indicator_counts: Dict[str, int] = (
+            {} if self.indicator_sketch is None else self.indicator_sketch.counts)
+
+        # Rows added so far and the first-seen place of every severity and
+        # indicator, so patch() + reorder() can restore key order without a
+        # rescan. None when unknown: sketched indicators, or old to_dict() data.
+        self.rows = 0
+        self.severity_places: Optional[Dict[str, Place]] = {}
+        self.indicator_places: Optional[Dict[str, Place]] = {} if self.indicator_sketch is None else None
+        # Keys whose first-seen row was patched away -> that row
+        self._displaced: Dict[Tuple[str, str], int] = {}
+
+    def add(self, category: str, classification: str, severity: str, indicators: Iterable[str]) -> None:
+        """Fold one scored result, the next row, into the counters."""
+
+        indicators = list(indicators)
+        self._fold(category, classification, severity, indicators)
+
+        row = self.rows
+        self.rows += 1
+        if self.severity_places is not None:
+            self.severity_places.setdefault(severity, (row, 0))
+        if self.indicator_places is not None:
+            for position, indicator in enumerate(indicators):
+                self.indicator_places.setdefault(indicator, (row, position))
+
+    def _fold(self, category: str, classification: str, severity: str, indicators: List[str]) -> None:
+        is_fabricated = classification in FABRICATED_CLASSIFICATIONS
+
+        self.total += 1
+        if is_fabricated:
+            self.fabricated += 1
+
+        stats = self.by_category.get(category)
+        if stats is None:
+            stats = self.by_category[category] = {"total": 0, "fabricated": 0}
+        stats["total"] += 1
+        if is_fabricated:
+            stats["fabricated"] += 1
+
+        self.by_severity[severity] = self.by_severity.get(severity, 0) + 1
+
+        if self.indicator_sketch is not None:
+            for indicator in indicators:
+                self.indicator_sketch.add(indicator)
+            return
+
+        counts = self.indicator_counts
+        for indicator in indicators:
+            counts[indicator] = counts.get(indicator, 0) + 1
+
+    def remove(self, category: str, classification: str, severity: str, indicators: Iterable[str]) -> None:
+        """
+        Take one previously added result out of the counters. Severities and
+        indicators whose count drops to zero are dropped, as a rescan would.
+        Not supported with an indicator sketch.
+        """
+
+        if self.indicator_sketch is not None:
+            raise ValueError("Results cannot be removed from sketched indicator counts")
+
+        is_fabricated = classification in FABRICATED_CLASSIFICATIONS
+
+        self.total -= 1
+        if is_fabricated:
+            self.fabricated -= 1
+
+        stats = self.by_category[category]
+        stats["total"] -= 1
+        if is_fabricated:
+            stats["fabricated"] -= 1
+        if not stats["total"]:
+            del self.by_category[category]
+
+        self.by_severity[severity] -= 1
+        if not self.by_severity[severity]:
+            del self.by_severity[severity]
+            self._forget("severity", severity, self.severity_places)
+
+        counts = self.indicator_counts
+        for indicator in indicators:
+            counts[indicator] -= 1
+            if not counts[indicator]:
+                del counts[indicator]
+                self._forget("indicator", indicator, self.indicator_places)
+
+    def _forget(self, kind: str, key: str, places: Optional[Dict[str, Place]]) -> None:
+        if places is not None:
+            places.pop(key, None)
+        self._displaced.pop((kind, key), None)
+
+    def patch(self, row: int, category: str, before: Tuple[str, str, List[str]],
+              after: Tuple[str, str, List[str]]) -> None:
+        """
+        Replace the already added result at ``row`` with a re-scored one.
+        ``before`` and ``after`` are (classification, severity, indicators).
+        Call reorder() once all rows are patched.
+        """
+
+        # Fold in before taking out, so a category never empties and moves
+        self._fold(category, *after)
+        self.remove(category, *before)
+
+        if self.severity_places is None or self.indicator_places is None:
+            return
+        self._replace_places("severity", self.severity_places, row, [before[1]], [after[1]])
+        self._replace_places("indicator", self.indicator_places, row, before[2], after[2])
+
+    def _replace_places(self, kind: str, places: Dict[str, Place], row: int,
+                        before: List[str], after: List[str]) -> None:
+        now = {}
+        for position, key in enumerate(after):
+            now.setdefault(key, (row, position))
+        for key in before:
+            # Still counted elsewhere, but its first row no longer has it
+            if key not in now and key in places and places[key][0] == row:
+                self._displaced[(kind, key)] = row
+        for key, place in now.items():
+            current = places.get(key)
+            if current is None or current[0] >= row:
+                places[key] = place
+                self._displaced.pop((kind, key), None)
+
+    def reorder(self, read_row: Callable[[int], Tuple[str, List[str]]]) -> None:
+        """
+        Restore first-seen severity and indicator order after patch().
+        ``read_row(row)`` returns (severity, indicators) of the current
+        result at ``row``. Only keys whose first row was patched away are
+        searched for, from that row on; without recorded places every row
+        is read from the start, until every key has been seen.
+        """
+
+        if self.severity_places is None or self.indicator_places is None:
+            self._reorder_by_scan(read_row)
+            return
+
+        row = min(self._displaced.values(), default=self.rows)
+        while self._displaced:
+            severity, indicators = read_row(row)
+            if ("severity", severity) in self._displaced:
+                del self._displaced[("severity", severity)]
+                self.severity_places[severity] = (row, 0)
+            for position, indicator in enumerate(indicators):
+                if ("indicator", indicator) in self._displaced:
+                    del self._displaced[("indicator", indicator)]
+                    self.indicator_places[indicator] = (row, position)
+            row += 1
+
+        self.by_severity = dict(sorted(self.by_severity.items(), key=lambda x: self.severity_places[x[0]]))
+        self.indicator_counts = dict(sorted(self.indicator_counts.items(),
+                                            key=lambda x: self.indicator_places[x[0]]))
+
+    def _reorder_by_scan(self, read_row: Callable[[int], Tuple[str, List[str]]]) -> None:
+        severities: Dict[str, None] = {}
+        indicators: Dict[str, None] = {}
+        for row in range(self.rows):
+            severity, row_indicators = read_row(row)
+            severities.setdefault(severity, None)
+            for indicator in row_indicators:
+                indicators.setdefault(indicator, None)
+            if len(severities) >= len(self.by_severity) and len(indicators) >= len(self.indicator_counts):
+                break
+
+        self.by_severity = {severity: self.by_severity[severity] for severity in severities}
+        self.indicator_counts = {indicator: self.indicator_counts[indicator] for indicator in indicators}
+        self._displaced.clear()
+
+    def merge(self, other: "PatternAggregates") -> None:
+        """
+        Fold another set of counters into this one. Merging shards in input
+        order gives exactly the counters (and key order) of one pass over
+        all of their results.
+        """
+
+        self.total += other.total
+        self.fabricated += other.fabricated
+        self.severity_places = self._merge_places(self.severity_places, other.severity_places)
+        self.indicator_places = self._merge_places(self.indicator_places, other.indicator_places)
+        self.rows += other.rows
+
+        for category, other_stats in other.by_category.items():
+            stats = self.by_category.get(category)
+            if stats is None:
+                stats = self.by_category[category] = {"total": 0, "fabricated": 0}
+            stats["total"] += other_stats["total"]
+            stats["fabricated"] += other_stats["fabricated"]
+
+        for severity, count in other.by_severity.items():
+            self.by_severity[severity] = self.by_severity.get(severity, 0) + count
+
+        if self.indicator_sketch is not None:
+            other_sketch = other.indicator_sketch
+            if other_sketch is None:
+                other_sketch = SpaceSaving(max(1, len(other.indicator_counts)))
+                for indicator, count in other.indicator_counts.items():
+                    other_sketch.add(indicator, count)
+            self.indicator_sketch.merge(other_sketch)
+            self.indicator_counts = self.indicator_sketch.counts
+            return
+        if other.indicator_sketch is not None:
+            raise ValueError("Cannot merge sketched indicator counts into exact ones")
+
+        counts = self.indicator_counts
+        for indicator, count in other.indicator_counts.items():
+            counts[indicator] = counts.get(indicator, 0) + count
+
+    def _merge_places(self, places: Optional[Dict[str, Place]],
+                      other_places: Optional[Dict[str, Place]]) -> Optional[Dict[str, Place]]:
+        """First-seen places after appending ``other``'s rows below this one's."""
+
+        if places is None or other_places is None:
+            return None
+        for key, (row, position) in other_places.items():
+            places.setdefault(key, (self.rows + row, position))
+        return places
+
+    def to_dict(self) -> Dict:
+        """Serializable form, keeping first-seen key order (unlike snapshot())."""
+
+        data = {
+            "total": self.total,
+            "fabricated": self.fabricated,
+            "by_category": {category: dict(stats) for category, stats in self.by_category.items()},
+            "by_severity": dict(self.by_severity),
+            "indicator_counts": dict(self.indicator_counts),
+            "rows": self.rows
+        }
+        if self.severity_places is not None and self.indicator_places is not None:
+            data["severity_places"] = self.severity_places
+            data["indicator_places"] = self.indicator_places
+        if self.indicator_sketch is not None:
+            data["indicator_sketch"] = self.indicator_sketch.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PatternAggregates":
+        """Rebuild counters saved with to_dict()."""
+
+        aggregates = cls()
+        aggregates.total = data["total"]
+        aggregates.fabricated = data["fabricated"]
+        aggregates.by_category = {category: dict(stats) for category, stats in data["by_category"].items()}
+        aggregates.by_severity = dict(data["by_severity"])
+        if "indicator_sketch" in data:
+            aggregates.indicator_sketch = SpaceSaving.from_dict(data["indicator_sketch"])
+            aggregates.indicator_counts = aggregates.indicator_sketch.counts
+        else:
+            aggregates.indicator_counts = dict(data["indicator_counts"])
+
+        aggregates.rows = data.get("rows", aggregates.total)
+        if "severity_places" in data and "indicator_places" in data:
+            aggregates.severity_places = {key: tuple(place) for key, place in data["severity_places"].items()}
+            aggregates.indicator_places = {key: tuple(place) for key, place in data["indicator_places"].items()}
+        else:
+            aggregates.severity_places = aggregates.indicator_places = None
+        return aggregates
+
+    def snapshot(self) -> Dict:
+        """Return the counters in the analyze_patterns() ``patterns`` layout."""
+
+        return {
+            "by_category": {category: dict(stats) for category, stats in self.by_category.items()},
+            "by_severity": dict(self.by_severity),
+            "common_indicators": dict(sorted(self.indicator_counts.items(),
+                                             key=lambda x: x[1], reverse=True)),
+            "fabrication_rate": self.fabricated / self.total if self.total > 0 else 0.0
+        }
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Compiled phrase matcher for fabrication detection rules.
+
+Phrases are grouped by their leading word so a single substring probe on the
+lowercased response can rule out a whole group (e.g. every "this ..." phrase)
+before the individual phrases are checked.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+
+class PhraseMatcher:
+    """Matches a fixed phrase vocabulary against already-lowercased text."""
+
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases = tuple(dict.fromkeys(phrase.lower() for phrase in phrases))
+        self.index = {phrase: i for i, phrase in enumerate(self.phrases)}
+
+        groups: Dict[str, List[str]] = {}
+        for phrase in self.phrases:
+            head = phrase[:phrase.find(" ") + 1] if " " in phrase else phrase
+            groups.setdefault(head, []).append(phrase)
+
+        # Single-phrase groups need no separate prefix probe.
+        self._groups: Tuple[Tuple[str, Tuple[str, ...]], ...] = tuple(
+            ("" if len(members) == 1 else head, tuple(members))
+            for head, members in groups.items()
+        )
+
+    def find_all(self, text: str) -> List[str]:
+        """Return every phrase contained in ``text``, in vocabulary order."""
+
+        found = set()
+        for head, members in self._groups:
+            if head and head not in text:
+                continue
+            for phrase in members:
+                if phrase in text:
+                    found.add(phrase)
+        return [phrase for phrase in self.phrases if phrase in found]
+
+    def contains_any(self, text: str) -> bool:
+        """Return True as soon as any phrase is found in ``text``."""
+
+        for head, members in self._groups:
+            if head and head not in text:
+                continue
+            for phrase in members:
+                if phrase in text:
+                    return True
+        return False
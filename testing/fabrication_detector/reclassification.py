@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Incremental reclassification when detection rules change
+
+IncrementalReclassifier keeps an inverted index from every rule phrase to
+the results whose response contains it. When the suite moves to a new
+RuleSet, only the results the change can affect are scored again:
+
+- an added or removed phrase revisits the responses containing it (phrases
+  not yet indexed are found with one scan and then indexed too);
+- a changed fabricated threshold revisits results whose indicator count lies
+  between the old and new threshold;
+- a changed word limit revisits results with at least one phrase indicator;
+- edited classification or severity code revisits everything.
+
+Changed results are replaced in place and the suite's pattern aggregates are
+patched (old result out, new result in) instead of rebuilt. The aggregates
+know where each severity and indicator first appears, so restoring their
+order only reads rows when a key's first occurrence was patched away.
+
+Usage:
+    reclassifier = IncrementalReclassifier(suite)
+    reclassifier.apply(suite.rules().with_phrases(specific_claims=["the album features"]))
+"""
+
+from array import array
+from dataclasses import replace
+from typing import Dict, List, Optional, Set
+
+from .phrase_matcher import PhraseMatcher
+from .rule_sets import RuleSet, code_fingerprint
+
+# Marks honest results in the per-row indicator counts
+HONEST = -1
+
+
+def _normalized(phrases) -> tuple:
+    """Phrases as the matchers see them: lowercased, first occurrence kept."""
+    return tuple(dict.fromkeys(phrase.lower() for phrase in phrases))
+
+
+class IncrementalReclassifier:
+    """
+    Re-scores a suite's recorded results under new rules, touching only the
+    results a rule change can affect.
+
+    ``rules`` are the rules the recorded results were scored under (the
+    suite's current rules by default).
+    """
+
+    def __init__(self, suite, rules: Optional[RuleSet] = None):
+        if not getattr(suite.results, "keep_responses", True):
+            raise ValueError("Reclassification needs the response text of every result")
+
+        self.suite = suite
+        self.rules = rules or suite.rules()
+        self.code = code_fingerprint(type(suite))
+
+        # phrase -> rows whose lowercased response contains it, ascending
+        self.index: Dict[str, array] = {}
+        # Per row: number of indicators, or HONEST
+        self._indicator_counts = array("b")
+        self._results = None
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Index results recorded since the last call (or all, if self.results was replaced)."""
+
+        results = self.suite.results
+        if results is not self._results or len(results) < len(self._indicator_counts):
+            self._results = results
+            self._indicator_counts = array("b")
+            self.index = {phrase: array("I") for phrase in self.rules.phrases()}
+
+        start = len(self._indicator_counts)
+        if start < len(results):
+            self._index_rows(list(self.index), range(start, len(results)))
+            for row in range(start, len(results)):
+                self._indicator_counts.append(self._count(results[row]))
+
+    def _index_rows(self, phrases: List[str], rows) -> None:
+        matcher = PhraseMatcher(phrases)
+        for phrase in phrases:
+            self.index.setdefault(phrase, array("I"))
+        results = self._results
+        for row in rows:
+            for phrase in matcher.find_all(results[row].ai_response.lower()):
+                self.index[phrase].append(row)
+
+    @staticmethod
+    def _count(result) -> int:
+        if result.classification == "honest":
+            return HONEST
+        return min(len(result.fabrication_indicators), 127)
+
+    def affected(self, rules: RuleSet) -> List[int]:
+        """Rows whose classification ``rules`` could change, in ascending order."""
+
+        self.refresh()
+        count = len(self._indicator_counts)
+        if code_fingerprint(type(self.suite)) != self.code:
+            return list(range(count))
+
+        old, new = self.rules, rules
+        rows: Set[int] = set()
+
+        honest_changed = self._changed_phrases(old.honest_phrases, new.honest_phrases)
+        indicator_changed = (self._changed_phrases(old.specific_claims, new.specific_claims) |
+                             self._changed_phrases(old.confident_language, new.confident_language))
+
+        unindexed = [phrase for phrase in honest_changed | indicator_changed if phrase not in self.index]
+        if unindexed:
+            self._index_rows(unindexed, range(count))
+
+        for phrase in honest_changed:
+            rows.update(self.index[phrase])
+        # Honest results stay honest unless an honest phrase changed, and
+        # those are already covered above
+        counts = self._indicator_counts
+        for phrase in indicator_changed:
+            rows.update(row for row in self.index[phrase] if counts[row] != HONEST)
+
+        if new.fabricated_min_indicators != old.fabricated_min_indicators:
+            low, high = sorted((old.fabricated_min_indicators, new.fabricated_min_indicators))
+            rows.update(row for row, n in enumerate(counts) if n >= 1 and low <= n < high)
+
+        if new.detailed_word_limit != old.detailed_word_limit:
+            rows.update(row for row, n in enumerate(counts) if n >= 1)
+
+        return sorted(rows)
+
+    def _read_order_keys(self, row: int):
+        result = self._results[row]
+        return result.severity, result.fabrication_indicators
+
+    @staticmethod
+    def _changed_phrases(before, after) -> Set[str]:
+        before, after = _normalized(before), _normalized(after)
+        changed = set(before) ^ set(after)
+        # Indicators are emitted in list order, so reordering kept phrases
+        # changes every result containing one of them
+        kept = set(before) & set(after)
+        if [p for p in before if p in kept] != [p for p in after if p in kept]:
+            changed |= kept
+        return changed
+
+    def apply(self, rules: RuleSet) -> Dict:
+        """
+        Switch the suite to ``rules`` and re-score only the affected results.
+        Returns how many results were checked and how many changed.
+        """
+
+        suite = self.suite
+        rows = self.affected(rules)
+
+        suite._sync_aggregates()
+        aggregates = suite._aggregates
+        suite.use_rules(rules)
+
+        results = self._results
+        changed = 0
+        for row in rows:
+            result = results[row]
+            test_case = suite.catalog.get(result.test_id)
+            classification, indicators, severity = suite._score(test_case, result.ai_response)
+            if (classification == result.classification and severity == result.severity and
+                    indicators == result.fabrication_indicators):
+                continue
+
+            aggregates.patch(row, test_case.category,
+                             (result.classification, result.severity, result.fabrication_indicators),
+                             (classification, severity, indicators))
+            results[row] = replace(result, classification=classification,
+                                   fabrication_indicators=indicators, severity=severity)
+            self._indicator_counts[row] = self._count(results[row])
+            changed += 1
+
+        if changed:
+            aggregates.reorder(self._read_order_keys)
+            suite.analyze_patterns()
+
+        self.rules = rules
+        self.code = code_fingerprint(type(suite))
+        return {
+            "rule_version": suite.rule_version(),
+            "total": len(results),
+            "checked": len(rows),
+            "changed": changed
+        }
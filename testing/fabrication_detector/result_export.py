@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Compact export formats for test results
+
+- JSONL: one TestResult per line, appended (and flushed) as results arrive.
+- Columnar: a binary file of fixed-width columns. Test id, classification,
+  severity and indicators are dictionary-encoded as small integer codes;
+  free-text fields live in string heaps. ColumnarResults memory-maps the
+  file so pattern aggregation reads the code columns in place, without
+  building TestResult objects.
+
+Columnar layout:
+    MAGIC | uint32 header length | JSON header | padding | columns...
+The header holds the row count, the dictionaries and each column's
+(offset, length, typecode).
+"""
+
+import json
+import math
+import mmap
+import struct
+import sys
+from array import array
+from collections import Counter
+from dataclasses import asdict
+from typing import Dict, IO, Iterable, Iterator, List
+
+from .case_catalog import CaseCatalog
+from .fabrication_models import TestResult
+from .pattern_aggregates import FABRICATED_CLASSIFICATIONS
+
+COLUMNAR_MAGIC = b"FABCOL1\0"
+
+# Column name -> array typecode
+COLUMN_TYPES = {
+    "test_id": "I",
+    "classification": "B",
+    "severity": "B",
+    "confidence_score": "d",
+    "verification_notes": "I",
+    "indicator_offsets": "Q",
+    "indicator_ids": "I",
+    "timestamp_offsets": "Q",
+    "timestamp_heap": "B",
+    "response_offsets": "Q",
+    "response_heap": "B",
+    "cluster_id": "q",
+}
+
+
+def write_jsonl(results: Iterable[TestResult], stream: IO[str]) -> int:
+    """Write results as JSONL and return how many were written."""
+
+    count = 0
+    for result in results:
+        stream.write(json.dumps(asdict(result)))
+        stream.write("\n")
+        count += 1
+    return count
+
+
+def read_jsonl(stream: IO[str]) -> Iterator[TestResult]:
+    """Read back results written by write_jsonl, one per non-blank line."""
+
+    for line in stream:
+        if line.strip():
+            yield TestResult(**json.loads(line))
+
+
+class JsonlResultWriter:
+    """Appends each result to a JSONL file as soon as it is recorded."""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._file = open(filename, "a", encoding="utf-8")
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def write(self, result: TestResult) -> None:
+        self._file.write(json.dumps(asdict(result)))
+        self._file.write("\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _Dictionary:
+    """Assigns dense integer codes to values in first-seen order."""
+
+    def __init__(self):
+        self.codes: Dict = {}
+        self.values: List = []
+
+    def encode(self, value) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def write_columnar(results: Iterable[TestResult], catalog: CaseCatalog, filename: str) -> int:
+    """
+    Write results in the columnar format and return the row count.
+    Each test id's category is looked up in ``catalog`` and stored in the header.
+    """
+
+    test_ids, classifications, severities = _Dictionary(), _Dictionary(), _Dictionary()
+    indicators, notes = _Dictionary(), _Dictionary()
+    columns = {name: array(typecode) for name, typecode in COLUMN_TYPES.items()}
+    columns["indicator_offsets"].append(0)
+    columns["timestamp_offsets"].append(0)
+    columns["response_offsets"].append(0)
+
+    rows = 0
+    for result in results:
+        columns["test_id"].append(test_ids.encode(result.test_id))
+        columns["classification"].append(classifications.encode(result.classification))
+        columns["severity"].append(severities.encode(result.severity))
+        columns["confidence_score"].append(math.nan if result.confidence_score is None
+                                           else result.confidence_score)
+        columns["verification_notes"].append(notes.encode(result.verification_notes))
+
+        ids = columns["indicator_ids"]
+        ids.extend(indicators.encode(indicator) for indicator in result.fabrication_indicators)
+        columns["indicator_offsets"].append(len(ids))
+
+        for field, value in (("timestamp", result.timestamp), ("response", result.ai_response)):
+            heap = columns[f"{field}_heap"]
+            heap.frombytes(value.encode("utf-8", "surrogatepass"))
+            columns[f"{field}_offsets"].append(len(heap))
+        columns["cluster_id"].append(-1 if result.cluster_id is None else result.cluster_id)
+        rows += 1
+
+    header = {
+        "rows": rows,
+        "byteorder": sys.byteorder,
+        "dictionaries": {
+            "test_id": test_ids.values,
+            "category": [catalog.get(test_id).category for test_id in test_ids.values],
+            "classification": classifications.values,
+            "severity": severities.values,
+            "indicator": indicators.values,
+            "verification_notes": notes.values,
+        },
+        "columns": {},
+    }
+
+    # Column offsets depend on the header size, and the header lists the
+    # offsets; grow the reserved header space until the two agree.
+    reserved = 4096
+    while True:
+        offset = _align(len(COLUMNAR_MAGIC) + 4 + reserved)
+        for name, column in columns.items():
+            header["columns"][name] = {"offset": offset, "length": len(column),
+                                       "typecode": column.typecode, "itemsize": column.itemsize}
+            offset = _align(offset + len(column) * column.itemsize)
+        encoded = json.dumps(header).encode("utf-8")
+        if len(encoded) <= reserved:
+            break
+        reserved = len(encoded) * 2
+
+    with open(filename, "wb") as f:
+        f.write(COLUMNAR_MAGIC)
+        f.write(struct.pack("<I", reserved))
+        f.write(encoded.ljust(reserved, b" "))
+        for name, column in columns.items():
+            f.write(b"\0" * (header["columns"][name]["offset"] - f.tell()))
+            column.tofile(f)
+
+    return rows
+
+
+def _align(offset: int, boundary: int = 8) -> int:
+    return -(-offset // boundary) * boundary
+
+
+class ColumnarResults:
+    """Memory-mapped, read-only view over a columnar results file."""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._file = open(filename, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[:len(COLUMNAR_MAGIC)] != COLUMNAR_MAGIC:
+            self.close()
+            raise ValueError(f"{filename} is not a columnar results file")
+        (header_length,) = struct.unpack_from("<I", self._map, len(COLUMNAR_MAGIC))
+        start = len(COLUMNAR_MAGIC) + 4
+        self.header = json.loads(bytes(self._map[start:start + header_length]))
+        if self.header["byteorder"] != sys.byteorder:
+            self.close()
+            raise ValueError(f"{filename} was written with {self.header['byteorder']}-endian columns")
+
+        self.rows = self.header["rows"]
+        self.dictionaries = self.header["dictionaries"]
+        self._columns: Dict[str, memoryview] = {}
+
+    def column(self, name: str) -> memoryview:
+        """
+        Return a zero-copy typed view of one column. The view is shared
+        between calls and released by close().
+        """
+
+        view = self._columns.get(name)
+        if view is None:
+            spec = self.header["columns"][name]
+            start = spec["offset"]
+            end = start + spec["length"] * spec["itemsize"]
+            with memoryview(self._map) as whole:
+                view = self._columns[name] = whole[start:end].cast(spec["typecode"])
+        return view
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def analyze_patterns(self) -> Dict:
+        """Compute the analyze_patterns() ``patterns`` dict from the code columns."""
+
+        names = self.dictionaries
+        test_codes = self.column("test_id")
+        class_codes = self.column("classification")
+        fabricated_codes = {code for code, name in enumerate(names["classification"])
+                            if name in FABRICATED_CLASSIFICATIONS}
+
+        # Counters keep first-seen order, which is the order a row scan would produce
+        by_category: Dict[str, Dict[str, int]] = {}
+        fabricated = 0
+        for (test_code, class_code), count in Counter(zip(test_codes, class_codes)).items():
+            stats = by_category.setdefault(names["category"][test_code], {"total": 0, "fabricated": 0})
+            stats["total"] += count
+            if class_code in fabricated_codes:
+                stats["fabricated"] += count
+                fabricated += count
+
+        by_severity = {names["severity"][code]: count
+                       for code, count in Counter(self.column("severity")).items()}
+
+        indicator_counts = {names["indicator"][code]: count
+                            for code, count in Counter(self.column("indicator_ids")).items()}
+
+        return {
+            "by_category": by_category,
+            "by_severity": by_severity,
+            "common_indicators": dict(sorted(indicator_counts.items(), key=lambda x: x[1], reverse=True)),
+            "fabrication_rate": fabricated / self.rows if self.rows > 0 else 0.0
+        }
+
+    def iter_results(self) -> Iterator[TestResult]:
+        """Rebuild TestResult objects one row at a time."""
+
+        names = self.dictionaries
+        # Files written before cluster ids were added have no cluster column
+        columns = {name: self.column(name) for name in COLUMN_TYPES if name in self.header["columns"]}
+        clusters = columns.get("cluster_id")
+        timestamp_heap = columns["timestamp_heap"]
+        response_heap = columns["response_heap"]
+
+        indicator_ids = columns["indicator_ids"]
+        indicator_offsets = columns["indicator_offsets"]
+
+        for row in range(self.rows):
+            # Indexed rather than sliced: a slice held across the yield would
+            # keep the map exported and make close() fail
+            indicators = [names["indicator"][indicator_ids[i]]
+                          for i in range(indicator_offsets[row], indicator_offsets[row + 1])]
+            score = columns["confidence_score"][row]
+            yield TestResult(
+                test_id=names["test_id"][columns["test_id"][row]],
+                timestamp=_heap_string(timestamp_heap, columns["timestamp_offsets"], row),
+                ai_response=_heap_string(response_heap, columns["response_offsets"], row),
+                classification=names["classification"][columns["classification"][row]],
+                confidence_score=None if math.isnan(score) else score,
+                fabrication_indicators=indicators,
+                verification_notes=names["verification_notes"][columns["verification_notes"][row]],
+                severity=names["severity"][columns["severity"][row]],
+                cluster_id=None if clusters is None or clusters[row] < 0 else clusters[row]
+            )
+
+    def close(self) -> None:
+        """
+        Release every column view and unmap the file. Slices a caller has
+        taken of those views must be released first.
+        """
+
+        for view in self._columns.values():
+            view.release()
+        self._columns.clear()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "ColumnarResults":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _heap_string(heap: memoryview, offsets: memoryview, row: int) -> str:
+    return bytes(heap[offsets[row]:offsets[row + 1]]).decode("utf-8", "surrogatepass")
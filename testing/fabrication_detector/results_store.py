@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed results store for cross-run queries
+
+Every run's results are stored in one SQLite database, indexed by run,
+test id, category, classification and severity. Longitudinal questions
+("fabrication rate for Spotify cases over the last 30 runs") and run-to-run
+diffs are then single SQL queries instead of re-parsing one exported JSON
+file per run.
+
+Usage:
+    store = ResultsStore("results.db")
+    run_id = store.save_suite(suite, name="nightly")
+    store.fabrication_rate(subcategory="Spotify", last_runs=30)
+"""
+
+import hashlib
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .case_catalog import CaseCatalog
+from .fabrication_models import TestResult
+from .pattern_aggregates import FABRICATED_CLASSIFICATIONS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    name TEXT,
+    created TEXT NOT NULL,
+    rule_version TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    result_id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    test_id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    subcategory TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    ai_response TEXT NOT NULL,
+    response_hash TEXT NOT NULL,
+    classification TEXT NOT NULL,
+    fabricated INTEGER NOT NULL,
+    confidence_score REAL,
+    verification_notes TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    cluster_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS indicators (
+    indicator_id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS result_indicators (
+    result_id INTEGER NOT NULL REFERENCES results(result_id),
+    position INTEGER NOT NULL,
+    indicator_id INTEGER NOT NULL REFERENCES indicators(indicator_id),
+    PRIMARY KEY (result_id, position)
+);
+CREATE INDEX IF NOT EXISTS results_run ON results(run_id);
+CREATE INDEX IF NOT EXISTS results_test ON results(test_id, run_id);
+CREATE INDEX IF NOT EXISTS results_category ON results(category, run_id);
+CREATE INDEX IF NOT EXISTS results_subcategory ON results(subcategory, run_id);
+CREATE INDEX IF NOT EXISTS results_classification ON results(classification, run_id);
+CREATE INDEX IF NOT EXISTS results_severity ON results(severity, run_id);
+CREATE INDEX IF NOT EXISTS results_response ON results(run_id, test_id, response_hash);
+"""
+
+# Columns added to results after the first schema, as (name, type); databases
+# created earlier get them with ALTER TABLE on open
+ADDED_RESULT_COLUMNS = [("cluster_id", "INTEGER")]
+
+RESULT_COLUMNS = ("result_id", "run_id", "test_id", "category", "subcategory", "timestamp", "ai_response",
+                  "response_hash", "classification", "fabricated", "confidence_score", "verification_notes",
+                  "severity", "cluster_id")
+
+INSERT_RESULT = (f"INSERT INTO results ({', '.join(RESULT_COLUMNS)}) "
+                 f"VALUES ({', '.join('?' * len(RESULT_COLUMNS))})")
+
+
+def response_hash(response: str) -> str:
+    """Short content hash used to match the same response across runs."""
+    return hashlib.sha256(response.encode("utf-8", "surrogatepass")).hexdigest()[:32]
+
+
+class ResultsStore:
+    """Persistent, indexed store of test results across runs."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+        self._migrate()
+        self._indicator_ids: Dict[str, int] = dict(self.db.execute("SELECT text, indicator_id FROM indicators"))
+
+    def _migrate(self) -> None:
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(results)")}
+        with self.db:
+            for name, type in ADDED_RESULT_COLUMNS:
+                if name not in columns:
+                    self.db.execute(f"ALTER TABLE results ADD COLUMN {name} {type}")
+
+    def create_run(self, name: Optional[str] = None, rule_version: Optional[str] = None) -> int:
+        """Register a new run and return its id."""
+
+        with self.db:
+            return self._insert_run(name, rule_version)
+
+    def _insert_run(self, name: Optional[str], rule_version: Optional[str]) -> int:
+        cursor = self.db.execute("INSERT INTO runs (name, created, rule_version) VALUES (?, ?, ?)",
+                                 (name, datetime.now().isoformat(), rule_version))
+        return cursor.lastrowid
+
+    def add_results(self, run_id: int, results: Iterable[TestResult], catalog: CaseCatalog,
+                    batch_size: int = 10_000) -> int:
+        """Bulk-insert results into a run in one transaction; returns the count."""
+
+        with self._transaction():
+            return self._insert_results(run_id, results, catalog, batch_size)
+
+    def _insert_results(self, run_id: int, results: Iterable[TestResult], catalog: CaseCatalog,
+                        batch_size: int = 10_000) -> int:
+        count = 0
+        next_id = self.db.execute("SELECT COALESCE(MAX(result_id), 0) + 1 FROM results").fetchone()[0]
+        rows, links = [], []
+        for result in results:
+            case = catalog.get(result.test_id)
+            rows.append((next_id, run_id, result.test_id, case.category, case.subcategory,
+                         result.timestamp, result.ai_response, response_hash(result.ai_response),
+                         result.classification, int(result.classification in FABRICATED_CLASSIFICATIONS),
+                         result.confidence_score, result.verification_notes, result.severity,
+                         result.cluster_id))
+            links.extend((next_id, position, self._indicator_id(indicator))
+                         for position, indicator in enumerate(result.fabrication_indicators))
+            next_id += 1
+            count += 1
+            if len(rows) >= batch_size:
+                self._insert(rows, links)
+                rows, links = [], []
+        self._insert(rows, links)
+        return count
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """
+        Commit on success; on failure roll back and drop indicator ids that
+        were cached inside the rolled-back transaction.
+        """
+
+        try:
+            with self.db:
+                yield
+        except BaseException:
+            self._indicator_ids = dict(self.db.execute("SELECT text, indicator_id FROM indicators"))
+            raise
+
+    def _insert(self, rows: List, links: List) -> None:
+        self.db.executemany(INSERT_RESULT, rows)
+        self.db.executemany("INSERT INTO result_indicators VALUES (?, ?, ?)", links)
+
+    def _indicator_id(self, text: str) -> int:
+        indicator_id = self._indicator_ids.get(text)
+        if indicator_id is None:
+            cursor = self.db.execute("INSERT INTO indicators (text) VALUES (?)", (text,))
+            indicator_id = self._indicator_ids[text] = cursor.lastrowid
+        return indicator_id
+
+    def save_suite(self, suite, name: Optional[str] = None) -> int:
+        """Store all of a suite's results as a new run, in one transaction; returns the run id."""
+
+        with self._transaction():
+            run_id = self._insert_run(name, suite.rule_version())
+            self._insert_results(run_id, suite.results, suite.catalog)
+        return run_id
+
+    def runs(self, last: Optional[int] = None) -> List[Dict]:
+        """Return runs, newest first."""
+
+        query = "SELECT run_id, name, created, rule_version FROM runs ORDER BY run_id DESC"
+        params = ()
+        if last is not None:
+            query += " LIMIT ?"
+            params = (last,)
+        return [dict(zip(("run_id", "name", "created", "rule_version"), row))
+                for row in self.db.execute(query, params)]
+
+    def fabrication_rate(self, category: Optional[str] = None, subcategory: Optional[str] = None,
+                         test_id: Optional[str] = None, last_runs: Optional[int] = None) -> List[Dict]:
+        """
+        Per-run totals and fabrication rate, oldest run first, optionally
+        filtered by category, subcategory or test id and limited to the
+        most recent ``last_runs`` runs.
+        """
+
+        filters, params = [], []
+        for column, value in (("category", category), ("subcategory", subcategory), ("test_id", test_id)):
+            if value is not None:
+                filters.append(f"{column} = ?")
+                params.append(value)
+        if last_runs is not None:
+            filters.append("run_id IN (SELECT run_id FROM runs ORDER BY run_id DESC LIMIT ?)")
+            params.append(last_runs)
+
+        where = f"WHERE {' AND '.join(filters)}" if filters else ""
+        query = (f"SELECT run_id, COUNT(*), SUM(fabricated) FROM results {where} "
+                 "GROUP BY run_id ORDER BY run_id")
+        return [{"run_id": run_id, "total": total, "fabricated": fabricated,
+                 "fabrication_rate": fabricated / total if total else 0.0}
+                for run_id, total, fabricated in self.db.execute(query, params)]
+
+    def patterns(self, run_id: int) -> Dict:
+        """Rebuild a run's analyze_patterns() ``patterns`` dict with SQL aggregates."""
+
+        by_category = {
+            category: {"total": total, "fabricated": fabricated}
+            for category, total, fabricated in self.db.execute(
+                "SELECT category, COUNT(*), SUM(fabricated) FROM results WHERE run_id = ? "
+                "GROUP BY category ORDER BY MIN(result_id)", (run_id,))
+        }
+        by_severity = dict(self.db.execute(
+            "SELECT severity, COUNT(*) FROM results WHERE run_id = ? "
+            "GROUP BY severity ORDER BY MIN(result_id)", (run_id,)))
+        common_indicators = dict(self.db.execute(
+            "SELECT i.text, COUNT(*) FROM result_indicators ri "
+            "JOIN results r ON r.result_id = ri.result_id "
+            "JOIN indicators i ON i.indicator_id = ri.indicator_id "
+            "WHERE r.run_id = ? GROUP BY ri.indicator_id "
+            "ORDER BY COUNT(*) DESC, MIN(ri.result_id * 1000 + ri.position)", (run_id,)))
+
+        total = sum(stats["total"] for stats in by_category.values())
+        fabricated = sum(stats["fabricated"] for stats in by_category.values())
+        return {
+            "by_category": by_category,
+            "by_severity": by_severity,
+            "common_indicators": common_indicators,
+            "fabrication_rate": fabricated / total if total > 0 else 0.0
+        }
+
+    def diff_runs(self, before: int, after: int) -> Dict:
+        """
+        Compare two runs.
+
+        Returns per-test fabrication rates in each run, and the responses
+        present in both runs (same test id and response text) whose
+        classification or severity changed.
+        """
+
+        by_test = {}
+        for run_id, key in ((before, "before"), (after, "after")):
+            for test_id, total, fabricated in self.db.execute(
+                    "SELECT test_id, COUNT(*), SUM(fabricated) FROM results WHERE run_id = ? "
+                    "GROUP BY test_id", (run_id,)):
+                by_test.setdefault(test_id, {"before": None, "after": None})[key] = fabricated / total
+
+        changed = [
+            {"test_id": test_id, "ai_response": response,
+             "before": {"classification": old_class, "severity": old_severity},
+             "after": {"classification": new_class, "severity": new_severity}}
+            for test_id, response, old_class, old_severity, new_class, new_severity in self.db.execute(
+                "SELECT a.test_id, a.ai_response, a.classification, a.severity, "
+                "b.classification, b.severity FROM results a "
+                "JOIN results b ON b.run_id = ? AND b.test_id = a.test_id "
+                "AND b.response_hash = a.response_hash "
+                "WHERE a.run_id = ? AND (a.classification != b.classification OR a.severity != b.severity) "
+                "GROUP BY a.result_id", (after, before))
+        ]
+        return {"fabrication_rate_by_test": by_test, "changed": changed}
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
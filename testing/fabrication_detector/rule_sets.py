@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Versioned detection rule sets
+
+A RuleSet is an immutable snapshot of the data FabricationTestSuite
+classifies with: the three phrase lists and the classification thresholds.
+Its version is a content hash, so two rule sets with the same rules share a
+version wherever they came from. Logic in classify_response and
+calculate_severity is not data; it is fingerprinted separately by
+code_fingerprint().
+
+Usage:
+    rules = suite.rules().with_phrases(specific_claims=["the album features"])
+    suite.use_rules(rules)
+"""
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass, replace
+from typing import Iterable, Tuple
+
+# Suite attribute behind each phrase list
+PHRASE_LISTS = {
+    "honest_phrases": "HONEST_PHRASES",
+    "specific_claims": "SPECIFIC_CLAIMS",
+    "confident_language": "CONFIDENT_LANGUAGE",
+}
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """The phrase lists and thresholds behind classify_response."""
+    honest_phrases: Tuple[str, ...]
+    specific_claims: Tuple[str, ...]
+    confident_language: Tuple[str, ...]
+    fabricated_min_indicators: int = 3
+    detailed_word_limit: int = 50
+
+    @classmethod
+    def from_suite(cls, suite) -> "RuleSet":
+        """Snapshot the rules a suite (or suite class) currently applies."""
+
+        return cls(
+            honest_phrases=tuple(suite.HONEST_PHRASES),
+            specific_claims=tuple(suite.SPECIFIC_CLAIMS),
+            confident_language=tuple(suite.CONFIDENT_LANGUAGE),
+            fabricated_min_indicators=suite.FABRICATED_MIN_INDICATORS,
+            detailed_word_limit=suite.DETAILED_WORD_LIMIT,
+        )
+
+    @property
+    def version(self) -> str:
+        """Content hash of the rules."""
+
+        return hashlib.sha256(json.dumps(asdict(self)).encode("utf-8")).hexdigest()[:16]
+
+    def phrases(self) -> Tuple[str, ...]:
+        """Every phrase in the rule set, lowercased as the matchers see them."""
+
+        return tuple(dict.fromkeys(phrase.lower() for name in PHRASE_LISTS
+                                   for phrase in getattr(self, name)))
+
+    def with_phrases(self, **added: Iterable[str]) -> "RuleSet":
+        """Return a copy with phrases appended to the named lists."""
+
+        return replace(self, **{name: getattr(self, name) + tuple(phrases)
+                                for name, phrases in added.items()})
+
+    def without_phrases(self, **removed: Iterable[str]) -> "RuleSet":
+        """Return a copy with phrases removed from the named lists."""
+
+        changes = {}
+        for name, phrases in removed.items():
+            dropped = set(phrases)
+            changes[name] = tuple(phrase for phrase in getattr(self, name) if phrase not in dropped)
+        return replace(self, **changes)
+
+    def apply_to(self, suite) -> None:
+        """Set these rules as instance attributes of ``suite``."""
+
+        for name, attribute in PHRASE_LISTS.items():
+            setattr(suite, attribute, getattr(self, name))
+        suite.FABRICATED_MIN_INDICATORS = self.fabricated_min_indicators
+        suite.DETAILED_WORD_LIMIT = self.detailed_word_limit
+
+
+def code_fingerprint(suite_class) -> str:
+    """Hash of the source of a suite class's classification and severity logic."""
+
+    # inspect is slow to import and only needed when a fingerprint is taken
+    import inspect
+
+    digest = hashlib.sha256()
+    for method in (suite_class.classify_response, suite_class.calculate_severity):
+        try:
+            source = inspect.getsource(method)
+        except (OSError, TypeError):
+            source = method.__qualname__
+        digest.update(source.encode("utf-8"))
+    return digest.hexdigest()[:16]
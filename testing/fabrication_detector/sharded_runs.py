@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Map-reduce sharded runs
+
+A coordinator splits a corpus into shards in a work directory (local, or
+shared between machines), worker processes claim and score shards one at a
+time, and their partial pattern aggregates are merged into the final
+``patterns`` and report. Shards are contiguous slices of the input and are
+merged in shard order, so the result is exactly what one process scoring the
+whole corpus would produce.
+
+Two corpus kinds are supported:
+- responses: JSONL {test_id, response} records, scored like stream_pipeline;
+- cases: {test_id} records whose prompts workers send to an AI endpoint
+  (see async_runner), ``samples`` times each.
+
+Work directory layout:
+    manifest.json                 corpus kind and id, shard count, samples
+    shard_00000.jsonl             input records
+    shard_00000.claim             created (O_EXCL) by the worker that took the shard
+    shard_00000.results.jsonl     TestResults
+    shard_00000.summary.json      corpus id, result count, rule version and
+                                  aggregates; written last, so it marks the
+                                  shard done
+
+A worker that dies leaves a claim without a summary; delete the .claim file
+to make the shard available again. Splitting needs an empty (or new) work
+directory, and merging rejects summaries from any other corpus.
+
+Usage:
+    python -m fabrication_detector.sharded_runs run corpus.jsonl work/ --processes 4 -o report.md
+    python -m fabrication_detector.sharded_runs split corpus.jsonl work/ --shard-size 50000
+    python -m fabrication_detector.sharded_runs work work/            # on every machine
+    python -m fabrication_detector.sharded_runs merge work/ -o report.md
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import uuid
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import module_command, module_environment
+from .async_runner import AsyncRunner, OpenAIChatEndpoint
+from .fabrication_models import TestResult
+from .fabrication_test_suite import FabricationTestSuite
+from .pattern_aggregates import PatternAggregates
+from .result_export import read_jsonl, write_jsonl
+from .stream_pipeline import open_input, read_records, score_records
+
+MANIFEST = "manifest.json"
+
+
+def shard_name(directory: str, shard: int, suffix: str) -> str:
+    return os.path.join(directory, f"shard_{shard:05d}{suffix}")
+
+
+def _write_atomic(path: str, data: Dict) -> None:
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(temporary, path)
+
+
+def _write_shards(lines: Iterable[str], directory: str, shard_size: int) -> int:
+    """Write non-blank lines into consecutive shard files; returns the shard count."""
+
+    os.makedirs(directory, exist_ok=True)
+    if os.listdir(directory):
+        raise ValueError(f"Work directory {directory} is not empty; split into a new directory")
+    shards = 0
+    out = None
+    written = 0
+    try:
+        for line in lines:
+            if not line.strip():
+                continue
+            if out is None or written >= shard_size:
+                if out is not None:
+                    out.close()
+                out = open(shard_name(directory, shards, ".jsonl"), "w", encoding="utf-8")
+                shards += 1
+                written = 0
+            out.write(line if line.endswith("\n") else line + "\n")
+            written += 1
+    finally:
+        if out is not None:
+            out.close()
+    return shards
+
+
+def split_responses(input_path: str, directory: str, shard_size: int = 50_000) -> int:
+    """Split a JSONL response corpus into shards; returns the shard count."""
+
+    source = open_input(input_path)
+    try:
+        shards = _write_shards(source, directory, shard_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    _write_atomic(os.path.join(directory, MANIFEST), {"kind": "responses", "corpus_id": uuid.uuid4().hex,
+                                                      "shards": shards})
+    return shards
+
+
+def split_cases(test_ids: Iterable[str], directory: str, shard_size: int = 100, samples: int = 1) -> int:
+    """Split test cases into shards for workers to send to an endpoint; returns the shard count."""
+
+    shards = _write_shards((json.dumps({"test_id": test_id}) for test_id in test_ids), directory, shard_size)
+    _write_atomic(os.path.join(directory, MANIFEST), {"kind": "cases", "corpus_id": uuid.uuid4().hex,
+                                                      "shards": shards, "samples": samples})
+    return shards
+
+
+def read_manifest(directory: str) -> Dict:
+    with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def claim_shard(directory: str, shard: int) -> bool:
+    """Atomically claim a shard; False if another worker already has it."""
+
+    try:
+        fd = os.open(shard_name(directory, shard, ".claim"), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w") as f:
+        f.write(f"{socket.gethostname()}:{os.getpid()}\n")
+    return True
+
+
+def run_worker(directory: str, suite: Optional[FabricationTestSuite] = None, workers: Optional[int] = 1,
+               chunk_size: int = 512, endpoint_factory: Optional[Callable[[], object]] = None,
+               **runner_options) -> int:
+    """
+    Claim and score shards until none are left; returns how many this worker
+    scored. Case shards need an ``endpoint_factory`` returning a fresh
+    endpoint (see async_runner) for each shard's event loop.
+    """
+
+    if suite is None:
+        suite = FabricationTestSuite()
+        suite.load_test_cases()
+
+    manifest = read_manifest(directory)
+    if manifest["kind"] == "cases" and endpoint_factory is None:
+        raise ValueError("Case shards need an endpoint to send prompts to")
+
+    scored = 0
+    for shard in range(manifest["shards"]):
+        if not claim_shard(directory, shard):
+            continue
+        if manifest["kind"] == "cases":
+            results = _run_case_shard(suite, directory, shard, manifest.get("samples", 1),
+                                      endpoint_factory(), runner_options)
+        else:
+            results = _score_response_shard(suite, directory, shard, workers, chunk_size)
+        _write_shard_output(suite, directory, shard, manifest.get("corpus_id"), results)
+        scored += 1
+    return scored
+
+
+def _score_response_shard(suite: FabricationTestSuite, directory: str, shard: int,
+                          workers: Optional[int], chunk_size: int) -> Iterator[TestResult]:
+    with open(shard_name(directory, shard, ".jsonl"), encoding="utf-8") as source:
+        yield from score_records(suite, read_records(source), workers, chunk_size)
+
+
+def _run_case_shard(suite: FabricationTestSuite, directory: str, shard: int, samples: int,
+                    endpoint, runner_options: Dict) -> List[TestResult]:
+    with open(shard_name(directory, shard, ".jsonl"), encoding="utf-8") as source:
+        cases = [suite.catalog.get(record["test_id"]) for record in read_records(source)]
+    # Scored without run_test: a long-lived worker suite must not keep every
+    # shard's results, and _write_shard_output builds the shard's aggregates
+    runner = AsyncRunner(suite, endpoint, **dict(runner_options, record=False))
+    return asyncio.run(runner.run(cases, samples=samples))
+
+
+def _write_shard_output(suite: FabricationTestSuite, directory: str, shard: int, corpus_id: str,
+                        results: Iterable[TestResult]) -> None:
+    aggregates = PatternAggregates()
+
+    def aggregated(results):
+        for result in results:
+            aggregates.add(suite.catalog.get(result.test_id).category, result.classification,
+                           result.severity, result.fabrication_indicators)
+            yield result
+
+    path = shard_name(directory, shard, ".results.jsonl")
+    with open(f"{path}.tmp", "w", encoding="utf-8") as sink:
+        count = write_jsonl(aggregated(results), sink)
+    os.replace(f"{path}.tmp", path)
+
+    _write_atomic(shard_name(directory, shard, ".summary.json"), {
+        "shard": shard,
+        "corpus_id": corpus_id,
+        "count": count,
+        "rule_version": suite.rule_version(),
+        "aggregates": aggregates.to_dict()
+    })
+
+
+class ShardResults:
+    """The results of every shard, read lazily from disk in shard order."""
+
+    def __init__(self, paths: List[str], counts: List[int]):
+        self.paths = paths
+        self.counts = counts
+
+    def __len__(self) -> int:
+        return sum(self.counts)
+
+    def __iter__(self) -> Iterator[TestResult]:
+        for path in self.paths:
+            with open(path, encoding="utf-8") as f:
+                yield from read_jsonl(f)
+
+
+def merge_shards(directory: str) -> Tuple[ShardResults, PatternAggregates]:
+    """Merge every shard's summary, in shard order, into one set of aggregates."""
+
+    manifest = read_manifest(directory)
+    merged = PatternAggregates()
+    paths, counts, versions, missing, stale = [], [], set(), [], []
+
+    for shard in range(manifest["shards"]):
+        try:
+            with open(shard_name(directory, shard, ".summary.json"), encoding="utf-8") as f:
+                summary = json.load(f)
+        except FileNotFoundError:
+            missing.append(shard)
+            continue
+        if summary.get("corpus_id") != manifest.get("corpus_id"):
+            stale.append(shard)
+            continue
+        merged.merge(PatternAggregates.from_dict(summary["aggregates"]))
+        paths.append(shard_name(directory, shard, ".results.jsonl"))
+        counts.append(summary["count"])
+        versions.add(summary["rule_version"])
+
+    if stale:
+        raise ValueError(f"{len(stale)} shard(s) were scored for a different corpus: "
+                         f"{', '.join(map(str, stale[:10]))}")
+    if missing:
+        raise ValueError(f"{len(missing)} shard(s) not finished: {', '.join(map(str, missing[:10]))}")
+    if len(versions) > 1:
+        raise ValueError(f"Shards were scored under different rule versions: {', '.join(sorted(versions))}")
+    return ShardResults(paths, counts), merged
+
+
+def merged_suite(directory: str, suite: Optional[FabricationTestSuite] = None) -> FabricationTestSuite:
+    """A suite holding every shard's results and the merged patterns, ready for reporting."""
+
+    if suite is None:
+        suite = FabricationTestSuite()
+        suite.load_test_cases()
+    results, aggregates = merge_shards(directory)
+    suite.use_results(results, aggregates)
+    return suite
+
+
+def run_sharded(input_path: str, directory: str, processes: int = 2, shard_size: int = 50_000,
+                worker_args: Optional[List[str]] = None) -> FabricationTestSuite:
+    """
+    Split ``input_path`` into shards, score them with ``processes`` local
+    worker processes and return the merged suite.
+    """
+
+    split_responses(input_path, directory, shard_size)
+    command = module_command("sharded_runs") + ["work", directory] + (worker_args or [])
+    workers = [subprocess.Popen(command, env=module_environment()) for _ in range(processes)]
+    failed = [worker.args for worker in workers if worker.wait() != 0]
+    if failed:
+        raise RuntimeError(f"{len(failed)} worker process(es) failed")
+    return merged_suite(directory)
+
+
+def _write_outputs(suite: FabricationTestSuite, output: Optional[str], patterns: Optional[str]) -> None:
+    if output:
+        with open(output, "w") as f:
+            suite.write_report(f)
+        print(f"Report: {output}")
+    if patterns:
+        with open(patterns, "w") as f:
+            json.dump(suite.patterns, f, indent=2)
+        print(f"Patterns: {patterns}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Map-reduce sharded fabrication detection runs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Split, score with local worker processes and merge")
+    run.add_argument("input", help="JSONL response corpus ('-' for stdin, *.gz supported)")
+    run.add_argument("directory", help="Work directory for shards")
+    run.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    run.add_argument("--shard-size", type=int, default=50_000, help="Records per shard")
+
+    split = commands.add_parser("split", help="Split a corpus into shards")
+    split.add_argument("input", help="JSONL response corpus, or with --cases a file of test ids ('all' for the catalog)")
+    split.add_argument("directory", help="Work directory for shards")
+    split.add_argument("--shard-size", type=int, default=50_000, help="Records per shard")
+    split.add_argument("--cases", action="store_true", help="Split test cases to send to an endpoint")
+    split.add_argument("--samples", type=int, default=1, help="Responses to collect per case (with --cases)")
+
+    work = commands.add_parser("work", help="Claim and score shards until none are left")
+    work.add_argument("directory", help="Work directory for shards")
+    work.add_argument("--workers", type=int, default=1, help="Classification processes per worker")
+    work.add_argument("--base-url", default=None, help="Endpoint base URL (case shards)")
+    work.add_argument("--model", default=None, help="Endpoint model (case shards)")
+    work.add_argument("--api-key", default=os.environ.get("OPENAI_API_KEY"), help="API key (default: $OPENAI_API_KEY)")
+    work.add_argument("--concurrency", type=int, default=16, help="Requests in flight (case shards)")
+
+    merge = commands.add_parser("merge", help="Merge finished shards into patterns and a report")
+    merge.add_argument("directory", help="Work directory for shards")
+
+    for command in (run, merge):
+        command.add_argument("-o", "--output", default=None, help="Report file (Markdown)")
+        command.add_argument("--patterns", default=None, help="Write the merged patterns as JSON here")
+
+    args = parser.parse_args(argv)
+    try:
+        return _run_command(args)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+
+def _run_command(args: argparse.Namespace) -> int:
+    if args.command == "split":
+        if args.cases:
+            if args.input == "all":
+                suite = FabricationTestSuite()
+                suite.load_test_cases()
+                test_ids = [case.id for case in suite.test_cases]
+            else:
+                with open(args.input, encoding="utf-8") as f:
+                    test_ids = [line.strip() for line in f if line.strip()]
+            shards = split_cases(test_ids, args.directory, args.shard_size, args.samples)
+        else:
+            shards = split_responses(args.input, args.directory, args.shard_size)
+        print(f"Wrote {shards} shard(s) to {args.directory}")
+        return 0
+
+    if args.command == "work":
+        endpoint_factory = None
+        if args.base_url:
+            endpoint_factory = lambda: OpenAIChatEndpoint(args.base_url, args.model, api_key=args.api_key,
+                                                          max_connections=args.concurrency)
+        scored = run_worker(args.directory, workers=args.workers, endpoint_factory=endpoint_factory,
+                            **({"concurrency": args.concurrency} if endpoint_factory else {}))
+        print(f"Scored {scored} shard(s)", file=sys.stderr)
+        return 0
+
+    if args.command == "run":
+        suite = run_sharded(args.input, args.directory, args.processes, args.shard_size)
+    else:
+        suite = merged_suite(args.directory)
+    print(f"Merged {len(suite.results)} results "
+          f"(fabrication rate {suite.patterns['fabrication_rate']:.2%})")
+    _write_outputs(suite, args.output, args.patterns)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
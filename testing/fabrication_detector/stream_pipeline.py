@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Streaming JSONL ingest pipeline for fabrication detection
+
+Reads {"test_id": ..., "response": ...} records from a JSONL stream (a file,
+a .gz file, or stdin), classifies each one and writes TestResult records as
+JSONL to an output stream. Every stage is a generator, so neither the input
+corpus nor the results are ever held in memory; a slow writer simply stops
+records from being pulled off the input.
+
+Usage:
+    python -m fabrication_detector.stream_pipeline captures.jsonl.gz -o results.jsonl
+    cat captures.jsonl | python -m fabrication_detector.stream_pipeline - --workers 4
+"""
+
+import argparse
+import gzip
+import json
+import sys
+from itertools import tee
+from typing import Dict, IO, Iterable, Iterator, Optional, Tuple
+
+from .case_catalog import CaseCatalog
+from .fabrication_test_suite import FabricationTestSuite, TestCase, TestResult
+from .result_export import write_jsonl
+
+
+def open_input(path: str) -> IO[str]:
+    """Open a JSONL input as text: '-' for stdin, gzip for *.gz, else a plain file."""
+
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def open_output(path: str) -> IO[str]:
+    """Open a JSONL output as text: '-' for stdout, gzip for *.gz, else a plain file."""
+
+    if path == "-":
+        return sys.stdout
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+def read_records(stream: IO[str]) -> Iterator[Dict]:
+    """Yield one decoded record per non-blank line."""
+
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_number}: {e}") from e
+
+
+def resolve_cases(records: Iterable[Dict], catalog: CaseCatalog) -> Iterator[Tuple[TestCase, str]]:
+    """Pair each record's response with its test case."""
+
+    for record in records:
+        if not isinstance(record, dict):
+            raise ValueError(f"Input record is not an object: {record!r}")
+        test_id = record.get("test_id")
+        try:
+            test_case = catalog.get(test_id)
+        except KeyError:
+            raise ValueError(f"Unknown test_id in input: {test_id!r}") from None
+        response = record.get("response")
+        if not isinstance(response, str):
+            raise ValueError(f"Missing or non-string response for test_id {test_id!r}")
+        yield test_case, response
+
+
+def score_records(suite: FabricationTestSuite, records: Iterable[Dict],
+                  workers: Optional[int] = 1, chunk_size: int = 512) -> Iterator[TestResult]:
+    """Classify records lazily, yielding a TestResult per record in input order."""
+
+    to_score, to_pair = tee(resolve_cases(records, suite.catalog))
+
+    # classify_many keeps only a bounded window of chunks in flight, so the
+    # tee buffer between the two iterators stays bounded too.
+    scored = suite.classify_many(to_score, workers=workers, chunk_size=chunk_size)
+    for (test_case, response), (classification, indicators, severity) in zip(to_pair, scored):
+        yield suite.build_result(test_case, response, classification, indicators, severity)
+
+
+def run_pipeline(input_path: str = "-", output_path: str = "-", workers: Optional[int] = 1,
+                 chunk_size: int = 512, suite: Optional[FabricationTestSuite] = None) -> int:
+    """Stream input_path through the classifier into output_path; returns the record count."""
+
+    if suite is None:
+        suite = FabricationTestSuite()
+        suite.load_test_cases()
+
+    source = open_input(input_path)
+    sink = open_output(output_path)
+    try:
+        return write_jsonl(score_records(suite, read_records(source), workers, chunk_size), sink)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is sys.stdout:
+            sink.flush()
+        else:
+            sink.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify a JSONL stream of AI responses")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="JSONL input of {test_id, response} records ('-' for stdin, *.gz supported)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="JSONL output of test results ('-' for stdout, *.gz supported)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for classification (default: 1, in-process)")
+    parser.add_argument("--chunk-size", type=int, default=512,
+                        help="Records per worker chunk (default: 512)")
+    args = parser.parse_args()
+
+    count = run_pipeline(args.input, args.output, args.workers, args.chunk_size)
+    print(f"Classified {count} responses", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Bounded-memory statistics for long-running monitors
+
+- SlidingWindowStats: fabrication rate and severity counts over the last
+  ``window_seconds`` of result timestamps, kept in fixed-size time buckets,
+  so "last hour" figures need no stored results.
+- UnretainedResults: stands in for FabricationTestSuite.results when results
+  are only counted, not kept.
+
+Indicator counts are bounded separately, with the heavy_hitters sketch
+inside PatternAggregates. See FabricationTestSuite.enable_streaming_stats().
+"""
+
+import time
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+from .pattern_aggregates import FABRICATED_CLASSIFICATIONS
+
+
+class _Bucket:
+    __slots__ = ("total", "fabricated", "by_severity")
+
+    def __init__(self):
+        self.total = 0
+        self.fabricated = 0
+        self.by_severity: Dict[str, int] = {}
+
+
+class SlidingWindowStats:
+    """
+    Fabrication rate and severity counts over a trailing time window.
+
+    Results are bucketed by their timestamp into ``bucket_seconds`` slots;
+    only the slots covering the last ``window_seconds`` are kept, so memory
+    is bounded by window_seconds / bucket_seconds. Results older than the
+    window (relative to the newest one seen) are ignored.
+    """
+
+    def __init__(self, window_seconds: int = 3600, bucket_seconds: int = 60):
+        if window_seconds < bucket_seconds:
+            raise ValueError("window_seconds must be at least bucket_seconds")
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.bucket_count = -(-window_seconds // bucket_seconds)
+        self.buckets: Dict[int, _Bucket] = {}
+        self.newest: Optional[int] = None
+
+    def add(self, timestamp: str, classification: str, severity: str) -> None:
+        """Count one result by its ISO timestamp."""
+
+        slot = int(datetime.fromisoformat(timestamp).timestamp() // self.bucket_seconds)
+        if self.newest is None or slot > self.newest:
+            self.newest = slot
+            self._evict(slot)
+        elif slot <= self.newest - self.bucket_count:
+            return
+
+        bucket = self.buckets.get(slot)
+        if bucket is None:
+            bucket = self.buckets[slot] = _Bucket()
+        bucket.total += 1
+        if classification in FABRICATED_CLASSIFICATIONS:
+            bucket.fabricated += 1
+        bucket.by_severity[severity] = bucket.by_severity.get(severity, 0) + 1
+
+    def _evict(self, newest: int) -> None:
+        oldest = newest - self.bucket_count
+        for slot in [slot for slot in self.buckets if slot <= oldest]:
+            del self.buckets[slot]
+
+    def snapshot(self, now: Optional[float] = None) -> Dict:
+        """
+        Totals for the window ending at ``now`` (a Unix time; defaults to the
+        current time), at bucket granularity.
+        """
+
+        end = int((time.time() if now is None else now) // self.bucket_seconds)
+        start = end - self.bucket_count
+        total = fabricated = 0
+        by_severity: Dict[str, int] = {}
+        for slot in sorted(self.buckets):
+            if start < slot <= end:
+                bucket = self.buckets[slot]
+                total += bucket.total
+                fabricated += bucket.fabricated
+                for severity, count in bucket.by_severity.items():
+                    by_severity[severity] = by_severity.get(severity, 0) + count
+
+        return {
+            "window_seconds": self.window_seconds,
+            "start": datetime.fromtimestamp((start + 1) * self.bucket_seconds).isoformat(),
+            "end": datetime.fromtimestamp((end + 1) * self.bucket_seconds).isoformat(),
+            "total": total,
+            "fabricated": fabricated,
+            "fabrication_rate": fabricated / total if total > 0 else 0.0,
+            "by_severity": by_severity
+        }
+
+
+class UnretainedResults:
+    """A results container that counts appended results without keeping them."""
+
+    keep_responses = False
+
+    def __init__(self, count: int = 0):
+        self.count = count
+
+    def append(self, result) -> None:
+        self.count += 1
+
+    def extend(self, results) -> None:
+        for _ in results:
+            self.count += 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator:
+        return iter(())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return []
+        raise IndexError("results are not retained")